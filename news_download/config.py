@@ -17,6 +17,21 @@ DELTA_DATE_TEXT=int(os.getenv("DELTA_DATE_TEXT"))
 DOWNLOAD_ARTICLE_SLEEP = int(os.getenv("DOWNLOAD_ARTICLE_SLEEP"))*60
 DOWNLOAD_TEXT_SLEEP = int(os.getenv("DOWNLOAD_TEXT_SLEEP"))*60
 
+FEEDS_WORKERS = int(os.getenv("FEEDS_WORKERS", 8))
+FEEDS_WORKERS_PER_HOST = int(os.getenv("FEEDS_WORKERS_PER_HOST", 2))
+STORE_LISTING_BODY = os.getenv("STORE_LISTING_BODY", "1") == "1"
+FEED_STATE_PATH = os.getenv("FEED_STATE_PATH", "state/feed_state.json")
+FEED_MIN_INTERVAL = int(os.getenv("FEED_MIN_INTERVAL", 10))*60
+FEED_MAX_INTERVAL = int(os.getenv("FEED_MAX_INTERVAL", 24*60))*60
+
+HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", 30))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 50))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+USER_AGENT_POOL_SIZE = int(os.getenv("USER_AGENT_POOL_SIZE", 20))
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")
+
 DB_STRING = (
     f"{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}")
 DB_URI = f"postgresql+psycopg2://{DB_STRING}"
@@ -0,0 +1,175 @@
+"""
+Date parsing for the listing parsers.
+Results are timezone-aware datetimes in UTC which keep the wall-clock
+time written on the site, the same values published_parsed struct_time
+gave before (the containers run with TZ=UTC). Parsed strings are cached,
+a listing page repeats the same day for many news.
+"""
+import calendar
+import datetime
+import re
+from functools import lru_cache
+
+UTC = datetime.timezone.utc
+DATE_CACHE_SIZE = 4096
+
+ru_month_dict = {
+    "январ": "01",
+    "феврал": "02",
+    "март": "03",
+    "апрел": "04",
+    "май": "05",
+    "мая": "05",
+    "июн": "06",
+    "июл": "07",
+    "август": "08",
+    "сентябр": "09",
+    "октябр": "10",
+    "ноябр": "11",
+    "декабр": "12",
+}
+
+Monats = {
+    "января": "01",
+    "февраля": "02",
+    "марта": "03",
+    "апреля": "04",
+    "мая": "05",
+    "июня": "06",
+    "июля": "07",
+    "августа": "08",
+    "сентября": "09",
+    "октября": "10",
+    "ноября": "11",
+    "декабря": "12",
+}
+
+short_months = {
+    "янв": "01",
+    "фев": "02",
+    "мар": "03",
+    "апр": "04",
+    "май": "05",
+    "июн": "06",
+    "июл": "07",
+    "авг": "08",
+    "сен": "09",
+    "окт": "10",
+    "ноя": "11",
+    "дек": "12",
+}
+
+# month stem with one more letter, "мая" -> "05", in ru_month_dict order
+MONTH_PATTERNS = [
+    (stem, re.compile(stem + r"\w?"), number)
+    for stem, number in ru_month_dict.items()
+]
+YEAR_RE = re.compile(r"20\d\d")
+SPACES_RE = re.compile(r"\s{2,}")
+RELATIVE_RE = re.compile(r"(\d+) (\w+)")
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def strptime(text, fmt):
+    return datetime.datetime.strptime(text, fmt).replace(tzinfo=UTC)
+
+
+def first_strptime(text, formats):
+    """
+    Date in the first of formats which fits.
+    """
+    for fmt in formats[:-1]:
+        try:
+            return strptime(text, fmt)
+        except ValueError:
+            pass
+    return strptime(text, formats[-1])
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def replace_ru_month(text):
+    """
+    "11 мая 2022" -> "11 05 2022", the first month of ru_month_dict
+    found in the text is replaced by its number.
+    """
+    for stem, pattern, number in MONTH_PATTERNS:
+        if stem in text:
+            return pattern.sub(number, text)
+    return text
+
+
+def ru_date(text, fmt):
+    """
+    Date with a Russian month name, e.g. ru_date("11 мая 2022", "%d %m %Y").
+    """
+    return strptime(SPACES_RE.sub(" ", replace_ru_month(text)), fmt)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def day_month_year(text, with_time=False, lower=True):
+    """
+    "12 марта 2023" or "12 марта 2023 10:00", months from Monats.
+    """
+    parts = text.split(" ")
+    month = parts[1].lower() if lower else parts[1]
+    date = parts[2] + "." + Monats[month] + "." + parts[0]
+    if with_time:
+        return strptime(date + " " + parts[3], "%Y.%m.%d %H:%M")
+    return strptime(date, "%Y.%m.%d")
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def month_year(text):
+    """
+    "статья, март 2023" - the first day of the month.
+    """
+    text = text.lower()
+    year = YEAR_RE.findall(text)[0]
+    for stem, pattern, number in MONTH_PATTERNS:
+        if stem in text:
+            return strptime(f"{year}.{number}.01", "%Y.%m.%d")
+    raise ValueError(f"no month in {text}")
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def relative_seconds(text, units):
+    """
+    "5 часов назад" -> 18000, units are (first letters, seconds) pairs.
+    """
+    value, measure = RELATIVE_RE.findall(text)[0]
+    measure = measure.lower()
+    for prefix, unit in units:
+        if measure.startswith(prefix):
+            return int(value) * unit
+    return 0
+
+
+def relative_day(text, now, units):
+    """
+    The day of "5 часов назад" counted from now (wall-clock time of the site).
+    """
+    date = now - datetime.timedelta(seconds=relative_seconds(text, units))
+    return datetime.datetime(date.year, date.month, date.day, tzinfo=UTC)
+
+
+def to_datetime(value):
+    """
+    published_parsed of an entry as a timezone-aware datetime in UTC:
+    struct_time from feedparser is UTC, datetimes from this module
+    are returned as is.
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value.astimezone(UTC)
+    return datetime.datetime.fromtimestamp(calendar.timegm(value), tz=UTC)
+
+
+def cache_stats():
+    return {
+        "strptime": strptime.cache_info(),
+        "replace_ru_month": replace_ru_month.cache_info(),
+        "day_month_year": day_month_year.cache_info(),
+        "month_year": month_year.cache_info(),
+        "relative_seconds": relative_seconds.cache_info(),
+    }
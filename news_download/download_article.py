@@ -1,79 +1,46 @@
 import datetime
-import time
-import html
 import json
 import re
+import threading
 import urllib.parse
-from time import mktime, struct_time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import timezone
 
 import warnings
+from functools import partial
 import feedparser
 import pytz
-import requests
-from bs4 import BeautifulSoup
-
-from fake_useragent import UserAgent
 
 # from selenium import webdriver
 # from selenium.common.exceptions import TimeoutException
 # from selenium.webdriver.chrome.options import Options
-from transliterate import translit
-from config import DELTA_DATE_ARTICLE, is_leap_year, engine
+from config import (DELTA_DATE_ARTICLE, FEEDS_WORKERS, FEEDS_WORKERS_PER_HOST,
+                    STORE_LISTING_BODY, is_leap_year, engine)
+import dates
+import http_client
+import soup_builder
+from feed_entry import FeedEntry, entries_from_feedparser
+from feed_state import FeedState
 from models import Article, Feed, ExcludedFilter
-from sqlalchemy import select, update
-from sqlalchemy.orm import sessionmaker, Session
-from filter.preprocessing import check_stop_words
+from scheduler import FeedSchedule
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from filter.preprocessing import cache_stats, check_stop_words
 
 MSK = pytz.timezone("Europe/Moscow")
-ru_month_dict = {
-    "январ": "01",
-    "феврал": "02",
-    "март": "03",
-    "апрел": "04",
-    "май": "05",
-    "мая": "05",
-    "июн": "06",
-    "июл": "07",
-    "август": "08",
-    "сентябр": "09",
-    "октябр": "10",
-    "ноябр": "11",
-    "декабр": "12",
-}
-
-Monats = {
-    "января": "01",
-    "февраля": "02",
-    "марта": "03",
-    "апреля": "04",
-    "мая": "05",
-    "июня": "06",
-    "июля": "07",
-    "августа": "08",
-    "сентября": "09",
-    "октября": "10",
-    "ноября": "11",
-    "декабря": "12",
-}
-
 month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 
 
 class BaseParser:
     """ """
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, headers={"User-Agent": ua.random}, timeout=30, verify=False
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, headers=http_client.ua_headers(), timeout=30, verify=False
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def clear_space_hyp(self, value):
@@ -83,102 +50,180 @@ class BaseParser:
         return value
 
 
-class MontsameParser:
+class Select:
     """
-    Class to parse https://montsame.mn/ru/highlights?class=list news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Arguments of find/find_all: tag name, class and other attributes.
+    The strainer for soup_builder is built once.
     """
 
-    def __init__(self):
-        self.url_base = "https://montsame.mn/ru/"
+    def __init__(self, name=None, css_class=None, **attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+        if css_class:
+            self.attrs["class"] = css_class
+        self.strainer = soup_builder.only(name, css_class, **attrs)
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url, verify=False)
+    def find(self, tag):
+        return tag.find(self.name, self.attrs)
+
+    def find_all(self, tag):
+        return tag.find_all(self.name, self.attrs)
+
+
+def underscore_id(href):
+    return href.replace("/", "_")
+
+
+def date_formats(*formats):
+    """
+    Date in the first of the strptime formats which fits.
+    """
+
+    def parse(text, now):
+        return dates.first_strptime(text, formats)
+
+    return parse
+
+
+def day_month_year(lower=True, with_time=False):
+    """
+    Dates like "12 марта 2023" or "12 марта 2023 10:00".
+    """
+
+    def parse(text, now):
+        return dates.day_month_year(text, with_time, lower)
+
+    return parse
+
+
+def month_year(text, now):
+    """
+    Dates like "статья, март 2023", the first day of the month.
+    """
+    return dates.month_year(text)
+
+
+def relative_date(units):
+    """
+    Dates like "5 часов назад": units are seconds by the first letters
+    of the unit name, the result is rounded down to the day.
+    """
+    units = tuple(units.items())
+
+    def parse(text, now):
+        return dates.relative_day(text, now, units)
+
+    return parse
+
+
+class SelectorParser(BaseParser):
+    """
+    Listing parser described by data instead of a class.
+    item selects the news blocks of the page, link, title and date are
+    looked up inside a block (title defaults to the link text).
+    title_clean and date_clean are "strip", "clear" (clear_space_hyp) or None,
+    make_id turns the link href into the entry id (None - href as is).
+    date_parser(text, now) returns datetime, now is the Moscow time
+    of the parse. Returns result with same fields which will be used
+    later as feedparser result.
+    """
+
+    def __init__(self, feed_title, url_base, item, link=Select("a"),
+                 title=None, title_clean=None, date=None, date_clean=None,
+                 date_parser=None, make_id=underscore_id, encoding=None):
+        self.feed_title = feed_title
+        self.url_base = url_base
+        self.item = item
+        self.link = link
+        self.title = title
+        self.title_clean = title_clean
+        self.date = date
+        self.date_clean = date_clean
+        self.date_parser = date_parser
+        self.make_id = make_id
+        self.encoding = encoding
+
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, headers=http_client.ua_headers(), timeout=30, verify=False
+        )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
-        return soup
+        text = r.content.decode(self.encoding) if self.encoding else r.text
+        return soup_builder.make_soup(text, parse_only)
+
+    def clean(self, value, how):
+        if how == "strip":
+            return value.strip()
+        if how == "clear":
+            return self.clear_space_hyp(value)
+        return value
 
     def parse(self, feed_url):
         result = {
             "feed": {
-                "title": "montsame",
+                "title": self.feed_title,
             },
             "href": feed_url,
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, self.item.strainer)
         if not soup:
+            print("soup is none")
             return result
 
-        d_now = datetime.datetime.now(tz=pytz.timezone("Europe/Moscow"))
+        now = datetime.datetime.now(tz=MSK)
+        for item in self.item.find_all(soup):
+            a = self.link.find(item)
+            if a is None:
+                continue
+            href = a.get("href")
+            title = self.title.find(item) if self.title else a
+            published = None
+            if self.date:
+                date_text = self.clean(
+                    self.date.find(item).text, self.date_clean)
+                published = self.date_parser(date_text, now)
+            result["entries"].append(FeedEntry(
+                id=self.make_id(href) if self.make_id else href,
+                title=self.clean(title.text, self.title_clean),
+                link=urllib.parse.urljoin(self.url_base, href),
+                published=published,
+            ))
+        return result
 
-        for item in soup.find_all("div", {"class": "news-box-list mr-3"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-            url_relative = item.find("a").get("href")
-            id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = item.find("div", {"class": "title"}).text
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-
-            time_data = item.find("div", {"class": "stat d-block"}).text
-            val, measure = re.findall(r"(\d+) (\w+)", time_data)[0]
-            measure = measure.lower()
-            val = int(val)
-
-            delta_days = 0
-            delta_seconds = 0
-
-            if measure.startswith("д"):
-                delta_days = val
-            elif measure.startswith("ч"):
-                delta_seconds = 60 * 60 * val
-            elif measure.startswith("м"):
-                delta_seconds = 60 * val
-            elif measure.startswith("с"):
-                delta_seconds = val
-
-            d_item = d_now - \
-                datetime.timedelta(days=delta_days, seconds=delta_seconds)
-            d_item = (
-                d_item.replace(hour=0)
-                .replace(minute=0)
-                .replace(second=0)
-                .replace(microsecond=0)
-            )
-            feed_item["published_parsed"] = struct_time(d_item.timetuple())
 
-            result["entries"].append(feed_item)
-        return result
+# https://montsame.mn/ru/highlights?class=list - no access to rss feed
+MontsameParser = partial(
+    SelectorParser,
+    feed_title="montsame",
+    url_base="https://montsame.mn/ru/",
+    item=Select("div", "news-box-list mr-3"),
+    title=Select("div", "title"),
+    date=Select("div", "stat d-block"),
+    date_parser=relative_date(
+        {"д": 24 * 60 * 60, "ч": 60 * 60, "м": 60, "с": 1}),
+)
 
 
 class TorgPredParser:
     """
-    Class to parse "https://<country_code>.minpromtorg.gov.ru/news/" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://<country_code>.minpromtorg.gov.ru/news/" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://{country_code}.minpromtorg.gov.ru"
-        self.url_json = "https://{country_code}.minpromtorg.gov.ru/api/ssp-news/v1/?isCurrentSiteOnly=true&per_page=20&page=1"
+        self.url_json = (
+            "https://{country_code}.minpromtorg.gov.ru/api/ssp-news/v1/"
+            "?isCurrentSiteOnly=true&per_page=20&page=1")
 
     def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(url, headers={"User-Agent": ua.random}, verify=False)
+        r = http_client.get(
+            url, headers=http_client.ua_headers(), verify=False)
         if r.status_code != 200:
             return None
         r_json = r.json()
@@ -186,8 +231,8 @@ class TorgPredParser:
 
     def parse(self, feed_url):
         country_code = re.findall(r"https\:\/\/(\w+)\.", feed_url)[0]
-        self.url_base = self.url_base.format(country_code=country_code)
-        self.url_json = self.url_json.format(country_code=country_code)
+        url_base = self.url_base.format(country_code=country_code)
+        url_json = self.url_json.format(country_code=country_code)
         result = {
             "feed": {
                 "title": f"torg_pred_{country_code}",
@@ -196,7 +241,7 @@ class TorgPredParser:
             "entries": [],
         }
 
-        r_json = self.get(self.url_json)
+        r_json = self.get(url_json)
         if not r_json:
             return result
 
@@ -205,55 +250,41 @@ class TorgPredParser:
             return result
 
         for item in r_data:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
-            url_friendly = item.get("friendlyUrl")
             id_ = item.get("id")
             url_relative = f"/news?id={id_}"
-            feed_item["id"] = id_
-
-            feed_item["title"] = item.get("title").strip()
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
 
+            published = None
             time_data = item.get("date")
             if time_data:
                 time_data = time_data[:10]
-                feed_item["published_parsed"] = struct_time(
-                    datetime.datetime.strptime(
-                        time_data, "%Y-%m-%d").timetuple()
-                )
-
-            if feed_item["published_parsed"] >= struct_time(
-                datetime.datetime.strptime(
-                    "2022-12-25", "%Y-%m-%d").timetuple()
-            ):
-                result["entries"].append(feed_item)
+                published = dates.strptime(time_data, "%Y-%m-%d")
+
+            if published >= dates.strptime("2022-12-25", "%Y-%m-%d"):
+                result["entries"].append(FeedEntry(
+                    id=id_,
+                    title=item.get("title").strip(),
+                    link=urllib.parse.urljoin(url_base, url_relative),
+                    published=published,
+                    body=item.get("text"),
+                ))
         return result
 
 
 class ReutersParser:
     """
     Class to parse "https://www.reuters.com" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.reuters.com"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -281,20 +312,14 @@ class ReutersParser:
 
         data1_articles = data1["result"]["articles"]
         for item in data1_articles:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-            feed_item["id"] = item["id"]
-            feed_item["title"] = item["title"]
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, item["canonical_url"]
+            feed_item = FeedEntry(
+                id=item["id"],
+                title=item["title"],
+                link=urllib.parse.urljoin(
+                    self.url_base, item["canonical_url"]),
+                published=dates.strptime(
+                    item["published_time"][:16], "%Y-%m-%dT%H:%M"),
             )
-            feed_item["published_parsed"] = datetime.datetime.strptime(
-                item["published_time"][:16], "%Y-%m-%dT%H:%M"
-            ).timetuple()
             if feed_item not in result["entries"]:
                 result["entries"].append(feed_item)
 
@@ -305,24 +330,19 @@ class ReutersParser:
             for k in data2[article_group]:
                 group_articles = data2[article_group][k]
                 try:
-                    group_articles = group_articles["data"]["result"]["articles"]
+                    group_articles = (
+                        group_articles["data"]["result"]["articles"])
                 except KeyError:
                     continue
                 for item in group_articles:
-                    feed_item = {
-                        "title": None,
-                        "published_parsed": None,
-                        "link": None,
-                        "id": None,
-                    }
-                    feed_item["id"] = item["id"]
-                    feed_item["title"] = item["title"]
-                    feed_item["link"] = urllib.parse.urljoin(
-                        self.url_base, item["canonical_url"]
+                    feed_item = FeedEntry(
+                        id=item["id"],
+                        title=item["title"],
+                        link=urllib.parse.urljoin(
+                            self.url_base, item["canonical_url"]),
+                        published=dates.strptime(
+                            item["published_time"][:16], "%Y-%m-%dT%H:%M"),
                     )
-                    feed_item["published_parsed"] = datetime.datetime.strptime(
-                        item["published_time"][:16], "%Y-%m-%dT%H:%M"
-                    ).timetuple()
                     if feed_item not in result["entries"]:
                         result["entries"].append(feed_item)
 
@@ -331,21 +351,20 @@ class ReutersParser:
 
 class XinhuaParser:
     """
-    Class to parse news from "https://english.news.cn/indepth/index.htm" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse news from "https://english.news.cn/indepth/index.htm"
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://english.news.cn"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url: str):
@@ -357,52 +376,41 @@ class XinhuaParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "tit"))
         if not soup:
             print("soup is none")
             return result
 
         for item in soup.find_all("div", {"class": "tit"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             url_relative = item.find("a").get("href")
             id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = item.find("a").text
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-
             time_data = item.find("span", {"class": "time"}).text
-            feed_item["published_parsed"] = time.strptime(
-                time_data, "%Y-%m-%d %H:%M:%S"
-            )
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=id_,
+                title=item.find("a").text,
+                link=urllib.parse.urljoin(self.url_base, url_relative),
+                published=dates.strptime(time_data, "%Y-%m-%d %H:%M:%S"),
+            ))
         return result
 
 
 class USDepartmentOfTreasuryParser:
     """
-    Class to parse "https://home.treasury.gov/news/press-releases" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://home.treasury.gov/news/press-releases" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://home.treasury.gov"
         self.url_feed = "https://home.treasury.gov/news/press-releases"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -414,7 +422,8 @@ class USDepartmentOfTreasuryParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("div", "content--2col__body"))
         if not soup:
             return result
 
@@ -422,12 +431,6 @@ class USDepartmentOfTreasuryParser:
         items = news_div.find_all("div")
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             headline = item.find("h3")
             if headline:
                 headline = headline.find("a")
@@ -438,37 +441,37 @@ class USDepartmentOfTreasuryParser:
                 continue
             date_i = item.find("time")
             date_i = date_i.get("datetime")
-            date_i = datetime.datetime.strptime(
+            date_i = dates.strptime(
                 date_i, "%Y-%m-%dT%H:%M:%SZ"
-            ).timetuple()
+            )
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class APNewsParser:
     """
-    Class to parse "https://apnews.com/hub/ap-top-news" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://apnews.com/hub/ap-top-news" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://apnews.com"
         self.url_feed = "https://apnews.com/hub/ap-top-news"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -480,20 +483,13 @@ class APNewsParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "FeedCard"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "FeedCard"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             title_i = item.find("h2", attrs={"class": "-cardHeading"}).text
             href = item.find("a", attrs={"data-key": "card-headline"})
             if not href:
@@ -503,37 +499,37 @@ class APNewsParser:
             url_i = urllib.parse.urljoin(self.url_base, href)
             date_i = item.find(
                 "span", attrs={"data-key": "timestamp"})["data-source"]
-            date_i = datetime.datetime.strptime(
+            date_i = dates.strptime(
                 date_i, "%Y-%m-%dT%H:%M:%SZ"
-            ).timetuple()
+            )
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class AgroobzorParser:
     """
-    Class to parse "https://agroobzor.ru/news.html" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://agroobzor.ru/news.html" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://agroobzor.ru"
         self.url_feed = "https://agroobzor.ru/news.html"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -545,56 +541,50 @@ class AgroobzorParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "blog-content"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "blog-content"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             a = item.find("a")
             title_i = a.text.strip()
             href = a.get("href")
             url_i = urllib.parse.urljoin(self.url_base, href)
 
             date_i = item.find("time")["datetime"]
-            date_i = datetime.datetime.strptime(
+            date_i = dates.strptime(
                 date_i, "%Y-%m-%dT%H:%M:%S+03:00"
-            ).timetuple()  # 2022-04-12T05:16:37+03:00
+            )  # 2022-04-12T05:16:37+03:00
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class MOFAJapanParser:
     """
-    Class to parse "https://www.mofa.go.jp/press/release/index.html" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://www.mofa.go.jp/press/release/index.html" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.mofa.go.jp"
         self.url_feed = "https://www.mofa.go.jp/press/release/index.html"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -614,37 +604,27 @@ class MOFAJapanParser:
         date_now = datetime.datetime.now()
 
         for dt in dts:
-            date_i = datetime.datetime.strptime(
-                dt.text, "%B %d"
-            )  # .timetuple()  # April 14
+            date_i = dates.strptime(dt.text, "%B %d")  # April 14
             if date_i.month == 12 and date_now.month == 1:
                 # если в январе парсим декабрь
                 date_i = date_i.replace(year=date_now.year - 1)
             else:
                 date_i = date_i.replace(year=date_now.year)
 
-            date_i = date_i.timetuple()
-
             dd_i = dt.find_next("dd")
             as_i = dd_i.find_all("a")
 
             for a in as_i:
-                feed_item = {
-                    "title": None,
-                    "published_parsed": None,
-                    "link": None,
-                    "id": None,
-                }
-
                 title_i = a.text
                 href = a["href"]
                 url_i = urllib.parse.urljoin(self.url_base, href)
 
-                feed_item["id"] = href
-                feed_item["title"] = title_i
-                feed_item["link"] = url_i
-                feed_item["published_parsed"] = date_i
-                result["entries"].append(feed_item)
+                result["entries"].append(FeedEntry(
+                    id=href,
+                    title=title_i,
+                    link=url_i,
+                    published=date_i,
+                ))
 
         return result
 
@@ -654,28 +634,29 @@ class CommonParser:
     For exportcenter.ru etc.
     """
 
+    # FeedOptions keys accepted by parse()
+    options = ("link_from_links", "body_from_summary")
+
     def __init__(self, timeout=60, verify=True, headers=None):
-        ua = UserAgent()
         self.timeout = timeout
         self.verify = verify
-        self.headers = {"User-Agent": ua.random}
+        self.headers = http_client.ua_headers()
         if headers:
             self.headers.update(headers)
 
     def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(
+        r = http_client.get(
             url, timeout=self.timeout, verify=self.verify, headers=self.headers
         )
         return r.status_code, r.url, r.text
 
-    def parse(self, feed_url):
+    def parse(self, feed_url, link_from_links=False, body_from_summary=False):
         rss_status, rss_url, rss_html = self.get(feed_url)
         result = feedparser.parse(rss_html)
         result["href"] = rss_url
         result["status"] = rss_status
+        result["entries"] = entries_from_feedparser(
+            result["entries"], link_from_links, body_from_summary)
         return result
 
 
@@ -684,42 +665,41 @@ class MIDParser:
     For mid.ru
     """
 
+    options = ("link_from_links", "body_from_summary")
+
     def __init__(self):
         pass
 
     def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(url, timeout=30, headers={"User-Agent": ua.random})
+        r = http_client.get(url, timeout=30, headers=http_client.ua_headers())
         if r.status_code != 200:
             return None
         return r.text
 
-    def parse(self, feed_url):
+    def parse(self, feed_url, link_from_links=False, body_from_summary=False):
         rss_html = self.get(feed_url)
         result = feedparser.parse(rss_html)
+        result["entries"] = entries_from_feedparser(
+            result["entries"], link_from_links, body_from_summary)
         return result
 
 
 class JapanNewsParser:
     """
-    Class to parse "https://japannews.yomiuri.co.jp" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://japannews.yomiuri.co.jp" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://japannews.yomiuri.co.jp"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -732,33 +712,27 @@ class JapanNewsParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("li", "clearfix"))
         if not soup:
             return result
 
         items = soup.find_all("li", attrs={"class": "clearfix"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             title_i = item.find("h2").text
             href = item.find("a").get("href")
             url_i = href
             date_i = item.find("p").text
             date_i = date_i.split(" - ")[0].strip()
-            date_i = datetime.datetime.strptime(
-                date_i, "%B %d, %Y").timetuple()
+            date_i = dates.strptime(
+                date_i, "%B %d, %Y")
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -766,20 +740,18 @@ class JapanNewsParser:
 class IQNAParser:
     """
     Class to parse "https://www.iqna.ir/ru/allnews" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.iqna.ir"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -791,19 +763,13 @@ class IQNAParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "text_container"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "text_container"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             a = item.find("a")
             title_i = a.get("title")
             href = a.get("href")
@@ -811,36 +777,36 @@ class IQNAParser:
 
             time_i = item.find(
                 "div", attrs={"class": "date_akhv"}).text.strip()
-            date_i = datetime.datetime.strptime(
+            date_i = dates.strptime(
                 time_i, "%H:%M , %Y %b %d"
-            ).timetuple()  # 10:37 , 2022 Apr 27
+            )  # 10:37 , 2022 Apr 27
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class CRIParser:
     """
-    Class to parse "http://russian.cri.cn/news/homeList/index.html" and "http://russian.cri.cn/news/interList/index.html" news
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "http://russian.cri.cn/news/homeList/index.html" and
+    "http://russian.cri.cn/news/interList/index.html" news
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "http://russian.cri.cn"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -852,33 +818,28 @@ class CRIParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "news-list"))
         if not soup:
             return result
 
         items = soup.find("div", attrs={"class": "news-list"}).find_all("a")
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             title_i = item.text
             url_i = item.get("href")
 
             if url_i:
                 time_i = url_i.rsplit("/", 2)[-2]
-                date_i = datetime.datetime.strptime(
+                date_i = dates.strptime(
                     time_i, "%Y%m%d"
-                ).timetuple()  # 20220425
+                )  # 20220425
 
-            feed_item["id"] = url_i
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=url_i,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -886,20 +847,18 @@ class CRIParser:
 class RuChinaParser:
     """
     Class to parse "http://russian.china.org.cn" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "http://russian.china.org.cn"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url)
+    def get(self, url, parse_only=None):
+        r = http_client.get(url)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -929,12 +888,6 @@ class RuChinaParser:
         items = soup.find_all("td", attrs={"class": re.compile(r"a12_[^F]+")})
 
         for item in items[1:]:  # без заголовка
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             a = item.find("a")
             if a:
                 href = a.get("href")
@@ -942,15 +895,16 @@ class RuChinaParser:
                     url_i = href
                     title_i = a.text.strip("\u200b")
                     date_i = item.text[:16]  # 2022-04-29 16:18
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_i, "%Y-%m-%d %H:%M"
-                    ).timetuple()
+                    )
 
-                    feed_item["id"] = url_i
-                    feed_item["title"] = title_i
-                    feed_item["link"] = url_i
-                    feed_item["published_parsed"] = date_i
-                    result["entries"].append(feed_item)
+                    result["entries"].append(FeedEntry(
+                        id=url_i,
+                        title=title_i,
+                        link=url_i,
+                        published=date_i,
+                    ))
                 else:
                     continue
             else:
@@ -962,23 +916,20 @@ class RuChinaParser:
 class CGTNParser:
     """
     Class to parse "https://russian.cgtn.com" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://russian.cgtn.com"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -993,19 +944,14 @@ class CGTNParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("div", "cg-content-description"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "cg-content-description"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             a = item.find("a")
             if a:
                 href = a.get("href")
@@ -1017,15 +963,16 @@ class CGTNParser:
                         date_i = date_i.text.strip().rsplit(" ", 1)[
                             0
                         ]  # 29 Apr, 2022 00:30 GMT+8
-                        date_i = datetime.datetime.strptime(
+                        date_i = dates.strptime(
                             date_i, "%d %b, %Y %H:%M"
-                        ).timetuple()
-
-                    feed_item["id"] = url_i
-                    feed_item["title"] = title_i
-                    feed_item["link"] = url_i
-                    feed_item["published_parsed"] = date_i
-                    result["entries"].append(feed_item)
+                        )
+
+                    result["entries"].append(FeedEntry(
+                        id=url_i,
+                        title=title_i,
+                        link=url_i,
+                        published=date_i,
+                    ))
                 else:
                     continue
             else:
@@ -1037,23 +984,20 @@ class CGTNParser:
 class NGVParser:
     """
     Class to parse "http://www.ngv.ru/news/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "http://www.ngv.ru"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1069,20 +1013,14 @@ class NGVParser:
         if not soup:
             return result
 
-        items = soup.find_all("div", attrs={"class": "big-news-card"}) + soup.find_all(
-            "div", attrs={"class": "news-card"}
+        items = (
+            soup.find_all("div", attrs={"class": "big-news-card"})
+            + soup.find_all("div", attrs={"class": "news-card"})
         )
-        date_now = datetime.datetime.now()
 
         for item in items:
             if len(item.get("class")) > 1:
                 continue
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
 
             a = item.find("a")
             if a:
@@ -1099,62 +1037,37 @@ class NGVParser:
             )
             if date_string_i:
                 date_string_i = date_string_i.text.strip()
-                for m in ru_month_dict:
-                    if m in date_string_i:
-                        pattern = f"{m}\w?"
-                        date_string_i = re.sub(
-                            pattern, ru_month_dict[m], date_string_i)
-                        break
-                date_string_i = re.sub(r"\s{2,}", " ", date_string_i)
-
-                date_i = datetime.datetime.strptime(
-                    date_string_i, "%d %m %Y"
-                )  # 11 05 2022
-                date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+                # 11 мая 2022
+                date_i = dates.ru_date(date_string_i, "%d %m %Y")
+
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class MetalBulletinParser:
     """
-    Class to parse "https://www.metalbulletin.ru/news/" news - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse "https://www.metalbulletin.ru/news/" news
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.metalbulletin.ru"
-        self.ru_month_dict = {
-            "янв": "01",
-            "фев": "02",
-            "мар": "03",
-            "апр": "04",
-            "май": "05",
-            "июн": "06",
-            "июл": "07",
-            "авг": "08",
-            "сен": "09",
-            "окт": "10",
-            "ноя": "11",
-            "дек": "12",
-        }
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = soup_builder.make_soup(r.text, parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1166,7 +1079,7 @@ class MetalBulletinParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "one_news"))
         if not soup:
             return result
 
@@ -1176,135 +1089,61 @@ class MetalBulletinParser:
         for tr in main_div.find_all("tr"):
             if tr.get("bgcolor"):
                 date_main = re.sub(r"\s+", " ", tr.text).strip()
-                day, month, year = re.findall(r"(\d{2})\s(\w+)\.\s(\d{4})", date_main)[
-                    0
-                ]
+                day, month, year = re.findall(
+                    r"(\d{2})\s(\w+)\.\s(\d{4})", date_main)[0]
                 month = month.lower()
-                month = self.ru_month_dict.get(month)
-                date_main = datetime.datetime.strptime(
-                    f"{year}.{month}.{day}", "%Y.%m.%d"
-                )
+                month = dates.short_months.get(month)
+                date_main = dates.strptime(f"{year}.{month}.{day}", "%Y.%m.%d")
             else:
-                feed_item = {
-                    "title": None,
-                    "published_parsed": None,
-                    "link": None,
-                    "id": None,
-                }
                 all_tds = tr.find_all("td")
                 if len(all_tds) == 2:
                     time_i, title_href = all_tds
                     hour, minute = [int(i) for i in time_i.text.split(":")]
                     date_i = date_main.replace(hour=hour, minute=minute)
-                    date_i = date_i.timetuple()
                     title_i = title_href.text
                     href_i = title_href.find("a")
                     if href_i:
                         href_i = href_i.get("href")
                         url_i = href_i
-                        feed_item["id"] = href_i
-                        feed_item["title"] = title_i
-                        feed_item["link"] = url_i
-                        feed_item["published_parsed"] = date_i
-                        result["entries"].append(feed_item)
+                        result["entries"].append(FeedEntry(
+                            id=href_i,
+                            title=title_i,
+                            link=url_i,
+                            published=date_i,
+                        ))
         return result
 
 
-class CDUParser:
-    """
-    Class to parse "https://www.cdu.ru/tek_russia/articles" news
-    Returns result with same fields which will be used later as feedparser result.
-    """
-
-    def __init__(self):
-        self.url_base = "https://www.cdu.ru"
-
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=False, headers={"User-Agent": ua.random}
-        )
-        if r.status_code != 200:
-            return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
-        return soup
-
-    def parse(self, feed_url):
-        result = {
-            "feed": {
-                "title": "cdu",
-            },
-            "href": feed_url,
-            "entries": [],
-        }
-
-        soup = self.get(feed_url)
-        if not soup:
-            return result
-
-        items = soup.find_all("div", attrs={"id": re.compile(r"article.+")})
-
-        for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
-            a = item.find("a")
-            if a:
-                href = a.get("href")
-                url_i = urllib.parse.urljoin(self.url_base, href)
-                title_i = a.text
-
-            date_string_i = item.find("footer")
-            if date_string_i:
-                date_string_i = date_string_i.text.lower()
-                year = re.findall(r"20\d\d", date_string_i)[0]
-                for m in ru_month_dict:
-                    if re.findall(m, date_string_i):
-                        month = ru_month_dict[m]
-                        break
-                if year and month:
-                    date_i = datetime.datetime.strptime(
-                        f"{year}.{month}.01", "%Y.%m.%d"
-                    )
-
-                date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
-
-        return result
+# https://www.cdu.ru/tek_russia/articles
+CDUParser = partial(
+    SelectorParser,
+    feed_title="cdu",
+    url_base="https://www.cdu.ru",
+    item=Select("div", id=re.compile(r"article.+")),
+    date=Select("footer"),
+    date_parser=month_year,
+    make_id=None,
+    encoding="utf-8",
+)
 
 
 class ArgusParser:
     """
     Class to parse "https://www.argusmedia.com/ru/news" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.argusmedia.com"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1316,7 +1155,8 @@ class ArgusParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("div", "article-content-container"))
         if not soup:
             return result
 
@@ -1324,13 +1164,6 @@ class ArgusParser:
             "div", attrs={"class": "article-content-container"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             h1 = item.find("h1")
             if h1:
                 title_i = h1.text.strip()
@@ -1343,21 +1176,14 @@ class ArgusParser:
             date_string_i = item.find("div", attrs={"class": "article-date"})
             if date_string_i:
                 date_string_i = date_string_i.text.strip()
+                date_i = dates.ru_date(date_string_i, "%d %m %Y")
 
-                for m in ru_month_dict:
-                    if m in date_string_i:
-                        pattern = f"{m}\w?"
-                        date_string_i = re.sub(
-                            pattern, ru_month_dict[m], date_string_i)
-                        break
-                date_i = datetime.datetime.strptime(date_string_i, "%d %m %Y")
-                date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -1365,23 +1191,20 @@ class ArgusParser:
 class MilknewsParser:
     """
     Class to parse "https://milknews.ru/index/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://milknews.ru"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1393,19 +1216,13 @@ class MilknewsParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "news-list__item"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "news-list__item"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             if item.find("h2", attrs={"class": "section__subtitle"}):
                 continue
 
@@ -1422,25 +1239,15 @@ class MilknewsParser:
             if date_string_i:
                 date_string_i = date_string_i.text.strip()
                 date_string_i = date_string_i.lower().replace("г.", " ")
-                for m in ru_month_dict:
-                    if m in date_string_i:
-                        pattern = f"{m}\w?"
-                        date_string_i = re.sub(
-                            pattern, ru_month_dict[m], date_string_i)
-                        break
-                date_string_i = re.sub(r"\s{2,}", " ", date_string_i)
-                date_string_i
-
-                date_i = datetime.datetime.strptime(
-                    date_string_i, "%d %m %Y %H:%M"
-                )  # 11 05 2022 10:00
-                date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+                date_i = dates.ru_date(
+                    date_string_i, "%d %m %Y %H:%M")  # 11 мая 2022 г. 10:00
+
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -1448,23 +1255,20 @@ class MilknewsParser:
 class APKInformParser:
     """
     Class to parse "https://www.apk-inform.com/en/news" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.apk-inform.com"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1476,20 +1280,14 @@ class APKInformParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("div", "content-news-text"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "content-news-text"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             a = item.find("a", attrs={"class": "text"})
             if a:
                 title_i = a.text.strip()
@@ -1502,16 +1300,16 @@ class APKInformParser:
             if date_string_i:
                 date_string_i = date_string_i.get("datetime")
                 if date_string_i:
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_string_i, "%B %d, %Y %H:%M"
                     )
-                    date_i = date_i.timetuple()
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -1519,23 +1317,20 @@ class APKInformParser:
 class AfricabusinesscommunitiesParser:
     """
     Class to parse "https://africabusinesscommunities.com/news/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://africabusinesscommunities.com"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1547,20 +1342,13 @@ class AfricabusinesscommunitiesParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "newsitem"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "newsitem"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             a = item.find("a")
             if a:
                 title_i = a.text.strip()
@@ -1573,16 +1361,16 @@ class AfricabusinesscommunitiesParser:
             if date_string_i:
                 date_string_i = date_string_i.text
                 if date_string_i:
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_string_i, "%m-%d-%Y | %H:%M:%S"
                     )  # 05-17-2022 | 11:03:00
-                    date_i = date_i.timetuple()
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -1590,23 +1378,20 @@ class AfricabusinesscommunitiesParser:
 class AfricanewsParser:
     """
     Class to parse "https://www.africanews.com/news/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.africanews.com"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1618,7 +1403,8 @@ class AfricanewsParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("article", "just-in__article"))
         if not soup:
             return result
 
@@ -1626,13 +1412,6 @@ class AfricanewsParser:
         urls = []
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             a = item.find("a")
             if a:
                 title_i = a.text.strip()
@@ -1644,13 +1423,15 @@ class AfricanewsParser:
             timestamp_i = item.get("data-created")
             if timestamp_i:
                 timestamp_i = int(timestamp_i)
-                date_i = datetime.datetime.fromtimestamp(timestamp_i)
-                date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
+                date_i = datetime.datetime.fromtimestamp(
+                    timestamp_i, tz=dates.UTC)
+
+            feed_item = FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            )
 
             if url_i not in urls:
                 urls.append(url_i)
@@ -1662,23 +1443,20 @@ class AfricanewsParser:
 class NuzParser:
     """
     Class to parse "https://nuz.uz/feed" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://nuz.uz"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1690,20 +1468,13 @@ class NuzParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("div", "item-details"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "item-details"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             h = item.find("h3")
             a = h.find("a")
             if a:
@@ -1717,41 +1488,38 @@ class NuzParser:
                 date_string_i = date_string_i.get("datetime")
                 if date_string_i:
                     date_string_i = date_string_i.split("+")[0]
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_string_i, "%Y-%m-%dT%H:%M:%S"
                     )  # 2022-05-18T13:01:51+00:00
-                    date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
 
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class MofcomParser:
     """
-    Class to parse "http://english.mofcom.gov.cn/article/newsrelease/significantnews/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse
+    "http://english.mofcom.gov.cn/article/newsrelease/significantnews/" news
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "http://english.mofcom.gov.cn"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1763,7 +1531,7 @@ class MofcomParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("ul", "txtList_01"))
         if not soup:
             return result
 
@@ -1779,13 +1547,6 @@ class MofcomParser:
             if item.get("class"):
                 continue
 
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             a = item.find("a")
             if a:
                 title_i = a.text.strip()
@@ -1797,19 +1558,20 @@ class MofcomParser:
             date_string_i = item.find("script")
             if date_string_i:
                 date_string_i = re.findall(
-                    r"\d{4}\-\d{2}\-\d{2} \d{2}\:\d{2}\:\d{2}", date_string_i.text
+                    r"\d{4}\-\d{2}\-\d{2} \d{2}\:\d{2}\:\d{2}",
+                    date_string_i.text,
                 )
                 if date_string_i:
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_string_i[0], "%Y-%m-%d %H:%M:%S"
                     )
-                    date_i = date_i.timetuple()
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
@@ -1817,23 +1579,20 @@ class MofcomParser:
 class CommerceGovInParser:
     """
     Class to parse "https://commerce.gov.in/press-releases/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://commerce.gov.in"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1845,20 +1604,14 @@ class CommerceGovInParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("div", "whats-new-wrapper"))
         if not soup:
             return result
 
         items = soup.find_all("div", attrs={"class": "whats-new-wrapper"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             a = item.find("a")
             if a:
                 title_i = a.text.strip()
@@ -1871,43 +1624,43 @@ class CommerceGovInParser:
                 "div", attrs={"class": "whats-new-calander"})
             if date_string_i:
                 date_string_i = re.findall(
-                    r".+(\d+)\w+\s{1,}(\w+)\s{1,}(\d+)", date_string_i.text.strip()
+                    r".+(\d+)\w+\s{1,}(\w+)\s{1,}(\d+)",
+                    date_string_i.text.strip(),
                 )
                 if date_string_i:
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         " ".join(date_string_i[0]).lower(), "%d %B %Y"
                     )
-                    date_i = date_i.timetuple()
 
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-            result["entries"].append(feed_item)
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
         return result
 
 
 class ThedticParser:
     """
-    Class to parse "http://www.thedtic.gov.za/category/the-dti-archives/media-room/media-statements/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse
+    "http://www.thedtic.gov.za/category/the-dti-archives/media-room/media-statements/"
+    news
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "http://www.thedtic.gov.za"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1919,7 +1672,8 @@ class ThedticParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(
+            feed_url, soup_builder.only("table", id="search_table"))
         if not soup:
             return result
 
@@ -1930,12 +1684,6 @@ class ThedticParser:
             return result
 
         for tr in news_table.find_all("tr"):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             all_tds = tr.find_all("td")
             if len(all_tds) == 2:
                 title_href, time_i = all_tds
@@ -1947,15 +1695,15 @@ class ThedticParser:
 
                 date_string_i = time_i.text
                 if date_string_i:
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_string_i, "%B %d, %Y")
-                    date_i = date_i.timetuple()
 
-                feed_item["id"] = href
-                feed_item["title"] = title_i
-                feed_item["link"] = url_i
-                feed_item["published_parsed"] = date_i
-                result["entries"].append(feed_item)
+                result["entries"].append(FeedEntry(
+                    id=href,
+                    title=title_i,
+                    link=url_i,
+                    published=date_i,
+                ))
 
         return result
 
@@ -1963,23 +1711,20 @@ class ThedticParser:
 class ExportcenterParser:
     """
     Class to parse "https://www.exportcenter.ru/press_center/" news
-    Returns result with same fields which will be used later as feedparser result.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.exportcenter.ru"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.get(
-            url, timeout=30, verify=True, headers={"User-Agent": ua.random}
+    def get(self, url, parse_only=None):
+        r = http_client.get(
+            url, timeout=30, verify=True, headers=http_client.ua_headers()
         )
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
         return soup
 
     def parse(self, feed_url):
@@ -1991,20 +1736,13 @@ class ExportcenterParser:
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("article", "news-card"))
         if not soup:
             return result
 
         items = soup.find_all("article", attrs={"class": "news-card"})
 
         for item in items:
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
             h = item.find("h3", attrs={"class": "news-card__title"})
             if h:
                 title_i = h.text.strip()
@@ -2018,247 +1756,81 @@ class ExportcenterParser:
             if date_string_i:
                 date_string_i = date_string_i.get("datetime")
                 if date_string_i:
-                    date_i = datetime.datetime.strptime(
+                    date_i = dates.strptime(
                         date_string_i, "%Y-%m-%d %H:%M"
                     )  # 2022-05-18 13:01
-                    date_i = date_i.timetuple()
-
-            feed_item["id"] = href
-            feed_item["title"] = title_i
-            feed_item["link"] = url_i
-            feed_item["published_parsed"] = date_i
-
-            result["entries"].append(feed_item)
-
-        return result
-
-
-class MinEconDevelParser(BaseParser):
-    """
-    Class to parse news from "https://economy.gov.ru/material/news/" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
-    """
-
-    def __init__(self):
-        self.url_base = "https://economy.gov.ru/material/news/"
-
-    def parse(self, feed_url: str):
-        result = {
-            "feed": {
-                "title": "min.econom",
-            },
-            "href": feed_url,
-            "entries": [],
-        }
-
-        soup = self.get(feed_url)
-        if not soup:
-            print("soup is none")
-            return result
-
-        for item in soup.find_all("div", {"class": "e-news__content"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-            url_relative = item.find("a").get("href")
-            id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = self.clear_space_hyp(item.find("a").text)
-
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-
-            time_data = self.clear_space_hyp(
-                item.find("div", {"class": "e-news__date"}).text
-            )
-
-            timedata = time_data.split(" ")
-            time_data = (
-                timedata[2]
-                + "."
-                + Monats[timedata[1]]
-                + "."
-                + timedata[0]
-                + " "
-                + timedata[3]
-            )
-            time_fmt = "%Y.%m.%d %H:%M"
-            feed_item["published_parsed"] = time.strptime(time_data, time_fmt)
-
-            result["entries"].append(feed_item)
-        return result
-
-
-class MinVRParser(BaseParser):
-    """
-    Class to parse news from "https://minvr.gov.ru/press-center/news/" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
-    """
-
-    def __init__(self):
-        self.url_base = "https://minvr.gov.ru/press-center/news/"
-
-    def parse(self, feed_url: str):
-        result = {
-            "feed": {
-                "title": "min.vostok",
-            },
-            "href": feed_url,
-            "entries": [],
-        }
-
-        soup = self.get(feed_url)
-        if not soup:
-            print("soup is none")
-            return result
-        for item in soup.find_all("div", {"class": "card--flex"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-
-            url_relative = item.find(
-                "a", {"class": "article__link"}).get("href")
-            id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = self.clear_space_hyp(
-                item.find("a", {"class": "article__link"}).text)
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-
-            time_data = item.find("span", {"class": "article__time"}).text
-            if time_data.find(":") > 0:
-                time_fmt = "%d.%m.%Y %H:%M"
-            else:
-                time_fmt = "%d.%m.%Y"
-            feed_item["published_parsed"] = time.strptime(time_data, time_fmt)
-            result["entries"].append(feed_item)
-        return result
-
-
-class MinTransParser(BaseParser):
-    """
-    Class to parse news from " https://mintrans.gov.ru/press-center/news" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
-    """
-
-    def __init__(self):
-        self.url_base = "https://mintrans.gov.ru/press-center/news"
-
-    def parse(self, feed_url: str):
-        result = {
-            "feed": {
-                "title": "mintrans",
-            },
-            "href": feed_url,
-            "entries": [],
-        }
-
-        soup = self.get(feed_url)
-        if not soup:
-            print("soup is none")
-            return result
 
-        for item in soup.find_all("div", {"class": "news-list-item"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-            url_relative = item.find("a").get("href")
-            id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
+            result["entries"].append(FeedEntry(
+                id=href,
+                title=title_i,
+                link=url_i,
+                published=date_i,
+            ))
 
-            feed_item["title"] = item.find(
-                "a", {"class": "news-text"}).text.strip()
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-
-            time_data = self.clear_space_hyp(
-                item.find("span", {"class": "date-span"}).text
-            )
-            timedata = time_data.split(" ")
-            if len(timedata[0]) == 1:
-                timedata[0] = "0" + timedata[0]
-            time_data = (
-                timedata[2] + "." + Monats[timedata[1].lower()] +
-                "." + timedata[0]
-            )
-            feed_item["published_parsed"] = time.strptime(
-                time_data, "%Y.%m.%d")
-
-            result["entries"].append(feed_item)
         return result
 
 
-class EaeunionParser(BaseParser):
-    """
-    Class to parse news from "https://eec.eaeunion.org/news/" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
-    """
+# https://economy.gov.ru/material/news/ - no access to rss feed
+MinEconDevelParser = partial(
+    SelectorParser,
+    feed_title="min.econom",
+    url_base="https://economy.gov.ru/material/news/",
+    item=Select("div", "e-news__content"),
+    title_clean="clear",
+    date=Select("div", "e-news__date"),
+    date_clean="clear",
+    date_parser=day_month_year(lower=False, with_time=True),
+)
+
+
+# https://minvr.gov.ru/press-center/news/ - no access to rss feed
+MinVRParser = partial(
+    SelectorParser,
+    feed_title="min.vostok",
+    url_base="https://minvr.gov.ru/press-center/news/",
+    item=Select("div", "card--flex"),
+    link=Select("a", "article__link"),
+    title_clean="clear",
+    date=Select("span", "article__time"),
+    date_parser=date_formats("%d.%m.%Y %H:%M", "%d.%m.%Y"),
+)
+
+
+# https://mintrans.gov.ru/press-center/news - no access to rss feed
+MinTransParser = partial(
+    SelectorParser,
+    feed_title="mintrans",
+    url_base="https://mintrans.gov.ru/press-center/news",
+    item=Select("div", "news-list-item"),
+    title=Select("a", "news-text"),
+    title_clean="strip",
+    date=Select("span", "date-span"),
+    date_clean="clear",
+    date_parser=day_month_year(),
+)
+
+
+# https://eec.eaeunion.org/news/ - no access to rss feed
+EaeunionParser = partial(
+    SelectorParser,
+    feed_title="euraz.econ.com",
+    url_base="https://eec.eaeunion.org/news/",
+    item=Select("div", "news-pane-item"),
+    link=Select("a", "news-pane-item__body"),
+    title=Select("span", "news-pane-item__h"),
+    title_clean="strip",
+    date=Select("span", "news-pane-item__date"),
+    date_clean="clear",
+    date_parser=day_month_year(),
+)
 
-    def __init__(self):
-        self.url_base = "https://eec.eaeunion.org/news/"
-
-    def parse(self, feed_url: str):
-        result = {
-            "feed": {
-                "title": "euraz.econ.com",
-            },
-            "href": feed_url,
-            "entries": [],
-        }
-
-        soup = self.get(feed_url)
-        if not soup:
-            print("soup is none")
-            return result
-
-        for item in soup.find_all("div", {"class": "news-pane-item"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
-            url_relative = item.find(
-                "a", {"class": "news-pane-item__body"}).get("href")
-            id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = item.find(
-                "span", {"class": "news-pane-item__h"}
-            ).text.strip()
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-            a = item.find("span", {"class": "news-pane-item__date"}).text
-            time_data = self.clear_space_hyp(
-                item.find("span", {"class": "news-pane-item__date"}).text
-            )
-
-            timedata = time_data.split(" ")
-            time_data = (
-                timedata[2] + "." + Monats[timedata[1].lower()] +
-                "." + timedata[0]
-            )
-            feed_item["published_parsed"] = time.strptime(
-                time_data, "%Y.%m.%d")
-
-            result["entries"].append(feed_item)
-        return result
 
 class PortNews(BaseParser):
     """
-    Class to parse news from "https://portnews.ru/news" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse news from "https://portnews.ru/news"
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
@@ -2273,54 +1845,51 @@ class PortNews(BaseParser):
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only(id="newsru"))
         if not soup:
             print("soup is none")
             return result
         block = soup.find_all(id="newsru")
-        dates = block[0].find_all("h1")
-        tables = block[0].find_all("table") 
-        for i in range(len(dates)):
+        days = block[0].find_all("h1")
+        tables = block[0].find_all("table")
+        for i in range(len(days)):
             for item in tables[i].find_all("tr"):
-                feed_item = {
-                    "title": None,
-                    "published_parsed": None,
-                    "link": None,
-                    "id": None,
-                }
-                time_news = item.find_all("td")[0].text 
+                time_news = item.find_all("td")[0].text
                 url_relative = item.find("a").get("href")
                 id_ = url_relative.replace("/", "_")
-                feed_item["id"] = id_
-                feed_item["title"] = item.find("a").text.strip()
-                feed_item["link"] = urllib.parse.urljoin(self.url_base, url_relative)
-                time_data = dates[i].text 
+                time_data = days[i].text
                 timedata = time_data.split(" ")
-                time_data = (timedata[2] + "." + Monats[timedata[1].lower()] +"." + timedata[0]) + " " + time_news
-                feed_item["published_parsed"] = time.strptime(time_data, "%Y.%m.%d %H:%M")
-                result["entries"].append(feed_item)
-        return result   
-    
+                time_data = (
+                    timedata[2] + "." + dates.Monats[timedata[1].lower()]
+                    + "." + timedata[0] + " " + time_news)
+                result["entries"].append(FeedEntry(
+                    id=id_,
+                    title=item.find("a").text.strip(),
+                    link=urllib.parse.urljoin(self.url_base, url_relative),
+                    published=dates.strptime(time_data, "%Y.%m.%d %H:%M"),
+                ))
+        return result
+
+
 class AhramParser(BaseParser):
     """
-    Class to parse news from "https://english.ahram.org.eg/Portal/3/Business.aspx" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse news from
+    "https://english.ahram.org.eg/Portal/3/Business.aspx"
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://english.ahram.org.eg/Portal/3/Business.aspx"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.post(
-            url, headers={"User-Agent": ua.random}, timeout=30, verify=False)
+    def get(self, url, parse_only=None):
+        r = http_client.post(
+            url, headers=http_client.ua_headers(), timeout=30, verify=False)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
-        return soup    
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
+        return soup
 
     def parse(self, feed_url: str):
         result = {
@@ -2331,51 +1900,43 @@ class AhramParser(BaseParser):
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        item_class = "col-md-6 col-lg-12 mar-top-outer"
+        soup = self.get(feed_url, soup_builder.only("div", item_class))
         if not soup:
             print("soup is none")
             return result
 
-        for item in soup.find_all("div", {"class": "col-md-6 col-lg-12 mar-top-outer"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
+        for item in soup.find_all("div", {"class": item_class}):
             url_relative = item.find("a").get("href")
             id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = item.find("a").text.strip()
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
-
-            feed_item["published_parsed"]=struct_time(datetime.datetime.now().timetuple())
+            result["entries"].append(FeedEntry(
+                id=id_,
+                title=item.find("a").text.strip(),
+                link=urllib.parse.urljoin(self.url_base, url_relative),
+                published=datetime.datetime.now(
+                    tz=dates.UTC).replace(microsecond=0),
+            ))
+        return result
 
-            result["entries"].append(feed_item)
-        return result   
 
 class AlBawaba(BaseParser):
     """
-    Class to parse news from "https://www.albawaba.com/business" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse news from "https://www.albawaba.com/business"
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
     def __init__(self):
         self.url_base = "https://www.albawaba.com/business"
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.post(
-            url, headers={"User-Agent": ua.random}, timeout=30, verify=False)
+    def get(self, url, parse_only=None):
+        r = http_client.post(
+            url, headers=http_client.ua_headers(), timeout=30, verify=False)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
-        return soup    
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
+        return soup
 
     def parse(self, feed_url: str):
         result = {
@@ -2386,48 +1947,41 @@ class AlBawaba(BaseParser):
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        item_class = ("field field--name-node-title field--type-ds "
+                      "field--label-hidden field--item")
+        soup = self.get(feed_url, soup_builder.only("div", item_class))
         if not soup:
             print("soup is none")
             return result
 
-        for item in soup.find_all("div", {"class": "field field--name-node-title field--type-ds field--label-hidden field--item"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
+        for item in soup.find_all("div", {"class": item_class}):
             url_relative = item.find("a").get("href")
             id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = item.find("a").text.strip()
-            feed_item["link"] = urllib.parse.urljoin(
-                self.url_base, url_relative)
+            result["entries"].append(FeedEntry(
+                id=id_,
+                title=item.find("a").text.strip(),
+                link=urllib.parse.urljoin(self.url_base, url_relative),
+                published=datetime.datetime.now(
+                    tz=dates.UTC).replace(microsecond=0),
+            ))
+        return result
 
-            feed_item["published_parsed"]=struct_time(datetime.datetime.now().timetuple())
-            result["entries"].append(feed_item)
-        return result 
-    
 
 class ArabTimes(BaseParser):
     """
-    Class to parse news from "http://www.arabtimesonline.com" - no access to rss feed.
-    Returns result with same fields which will be used later as feedparser result.
+    Class to parse news from "http://www.arabtimesonline.com"
+    - no access to rss feed.
+    Returns result with same fields which will be used later
+    as feedparser result.
     """
 
-    def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        ua = UserAgent()
-        r = requests.post(
-            url, headers={"User-Agent": ua.random}, timeout=30, verify=False)
+    def get(self, url, parse_only=None):
+        r = http_client.post(
+            url, headers=http_client.ua_headers(), timeout=30, verify=False)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.content.decode("utf-8"), features="html.parser")
-        return soup    
+        soup = soup_builder.make_soup(r.content.decode("utf-8"), parse_only)
+        return soup
 
     def parse(self, feed_url: str):
         result = {
@@ -2438,72 +1992,95 @@ class ArabTimes(BaseParser):
             "entries": [],
         }
 
-        soup = self.get(feed_url)
+        soup = self.get(feed_url, soup_builder.only("article", "item-list"))
         if not soup:
             print("soup is none")
             return result
 
         for item in soup.find_all("article", {"class": "item-list"}):
-            feed_item = {
-                "title": None,
-                "published_parsed": None,
-                "link": None,
-                "id": None,
-            }
             item_1 = item.find("h2", {"class": "post-box-title"})
             url_relative = item_1.find("a").get("href")
             id_ = url_relative.replace("/", "_")
-            feed_item["id"] = id_
-
-            feed_item["title"] = item_1.find("a").text.strip()
-
-            feed_item["link"] = item_1.find("a").get("href")
-            
-            feed_item["published_parsed"]=struct_time(datetime.datetime.now().timetuple())
+            result["entries"].append(FeedEntry(
+                id=id_,
+                title=item_1.find("a").text.strip(),
+                link=item_1.find("a").get("href"),
+                published=datetime.datetime.now(
+                    tz=dates.UTC).replace(microsecond=0),
+            ))
+        return result
 
-            result["entries"].append(feed_item)
-        return result        
 
 class No_Parse:
     def parse(self, feed_url):
         pass
 
 
-ParserByName = {
-    "AfricabusinesscommunitiesParser": AfricabusinesscommunitiesParser(),
-    "AfricanewsParser": AfricanewsParser(),
-    "AgroobzorParser": AgroobzorParser(),
-    "AhramParser": AhramParser(),
-    "AlBawaba": AlBawaba(),
-    "ArabTimes": ArabTimes(),
-    "APKInformParser": APKInformParser(),
-    "APNewsParser": APNewsParser(),
-    "CDUParser": CDUParser(),
-    "CGTNParser": CGTNParser(),
-    "CommerceGovInParser": CommerceGovInParser(),
-    "CommonParser": CommonParser(),
-    "CRIParser": CRIParser(),
-    "EaeunionParser": EaeunionParser(),
-    "ExportcenterParser": ExportcenterParser(),
-    "IQNAParser": IQNAParser(),
-    "JapanNewsParser": JapanNewsParser(),
-    "MetalBulletinParser": MetalBulletinParser(),
-    "MilknewsParser": MilknewsParser(),
-    "MinEconDevelParser": MinEconDevelParser(),
-    "MinTransParser": MinTransParser(),
-    "MinVRParser": MinVRParser(),
-    "MOFAJapanParser": MOFAJapanParser(),
-    "MofcomParser": MofcomParser(),
-    "MontsameParser": MontsameParser(),
-    "NGVParser": NGVParser(),
-    "no parser": No_Parse(),
-    "PortNews": PortNews(),
-    "ReutersParser": ReutersParser(),
-    "RuChinaParser": RuChinaParser(),
-    "ThedticParser": ThedticParser(),
-    "TorgPredParser": TorgPredParser(),
-    "USDepartmentOfTreasuryParser": USDepartmentOfTreasuryParser(),
-    "XinhuaParser": XinhuaParser(),
+class ParserRegistry:
+    """
+    Parser classes by Feed.parser_name.
+    A parser is created on first request and the instance is reused.
+    """
+
+    def __init__(self, parsers):
+        self.parsers = parsers
+        self.instances = {}
+        self.lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.parsers
+
+    def __getitem__(self, name):
+        with self.lock:
+            if name not in self.instances:
+                self.instances[name] = self.parsers[name]()
+            return self.instances[name]
+
+
+ParserByName = ParserRegistry({
+    "AfricabusinesscommunitiesParser": AfricabusinesscommunitiesParser,
+    "AfricanewsParser": AfricanewsParser,
+    "AgroobzorParser": AgroobzorParser,
+    "AhramParser": AhramParser,
+    "AlBawaba": AlBawaba,
+    "ArabTimes": ArabTimes,
+    "APKInformParser": APKInformParser,
+    "APNewsParser": APNewsParser,
+    "CDUParser": CDUParser,
+    "CGTNParser": CGTNParser,
+    "CommerceGovInParser": CommerceGovInParser,
+    "CommonParser": CommonParser,
+    "CRIParser": CRIParser,
+    "EaeunionParser": EaeunionParser,
+    "ExportcenterParser": ExportcenterParser,
+    "IQNAParser": IQNAParser,
+    "JapanNewsParser": JapanNewsParser,
+    "MetalBulletinParser": MetalBulletinParser,
+    "MilknewsParser": MilknewsParser,
+    "MinEconDevelParser": MinEconDevelParser,
+    "MinTransParser": MinTransParser,
+    "MinVRParser": MinVRParser,
+    "MOFAJapanParser": MOFAJapanParser,
+    "MofcomParser": MofcomParser,
+    "MontsameParser": MontsameParser,
+    "NGVParser": NGVParser,
+    "no parser": No_Parse,
+    "PortNews": PortNews,
+    "ReutersParser": ReutersParser,
+    "RuChinaParser": RuChinaParser,
+    "ThedticParser": ThedticParser,
+    "TorgPredParser": TorgPredParser,
+    "USDepartmentOfTreasuryParser": USDepartmentOfTreasuryParser,
+    "XinhuaParser": XinhuaParser,
+})
+
+# parse() options of feeds read by feedparser based parsers:
+# the link is in the entry links or the summary holds the full article text.
+# A parser gets only the options listed in its options attribute.
+FeedOptions = {
+    "rbc": {"link_from_links": True},
+    "aif": {"link_from_links": True},
+    "minpromtorg": {"body_from_summary": True},
 }
 
 
@@ -2516,6 +2093,16 @@ class FeedDownloader:
     def __init__(self):
         # self.feed_urls = feed_urls
         self.rss_raw = {}
+        self.feed_ids = {}
+        self.feeds_count = 0
+        self.host_limiter = http_client.HostLimiter(FEEDS_WORKERS_PER_HOST)
+        self.feed_state = FeedState()
+        self.schedule = FeedSchedule(self.feed_state)
+        self.feed_names = []
+        # validators of fetched feeds, saved to feed_state after the articles
+        self.validators = {}
+        self.fetched_ids = []
+        self.fetched_at = None
 
         # Session = sessionmaker(engine)
         self.session = Session(bind=engine)
@@ -2526,174 +2113,377 @@ class FeedDownloader:
             datetime.timedelta(delta)
         ).replace(hour=0, minute=0, second=0, microsecond=0)
 
-    def get_feeds(self):
-        feeds_count = 0
+    def get_validators(self, feed):
+        """
+        ETag, Last-Modified and body hash of the feed saved by the previous
+        runs.
+        Only the validators the site sent are used: if it sent neither header
+        the unchanged feed is found by the hash of the body.
+        """
+        state = self.feed_state.get(feed.name)
+        return {
+            key: state.get(key) for key in ("etag", "last_modified", "hash")
+        }
+
+    def parse_feed(self, parser, feed_name, feed_url, validators):
+        """
+        Runs in a worker thread, must not touch self.session.
+        Raises http_client.NotModified if the feed has not changed.
+        """
+        options = {
+            key: value for key, value in FeedOptions.get(feed_name, {}).items()
+            if key in getattr(parser, "options", ())
+        }
+        with self.host_limiter.get(feed_url), \
+                http_client.conditional(validators):
+            return parser.parse(feed_url, **options)
+
+    def commit_feed_state(self, name, new_count=0, published=(), saved=True):
+        """
+        Plan the next fetch of the feed. The new validators and the fetch time
+        are kept only if all its entries were saved, otherwise the next run
+        downloads the whole listing again instead of getting 304.
+        """
+        self.schedule.update(name, new_count, published)
+        if not saved:
+            return
+        self.feed_state.update(name, self.validators[name])
+        self.fetched_ids.append(self.feed_ids[name])
+
+    def save_feed_state(self):
+        """
+        Save validators and last_fetched_at of the feeds processed by this run.
+        """
+        self.feed_state.save()
+        if not self.fetched_ids:
+            return
+        try:
+            self.session.execute(
+                update(Feed)
+                .where(Feed.id.in_(self.fetched_ids))
+                .values(last_fetched_at=self.fetched_at)
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"last_fetched_at not updated: {e}")
+
+    def due_feeds(self):
+        """
+        Used feeds which are due by the schedule as plain
+        (name, id, url, validators, parser) tuples: Feed objects expire
+        after every commit and would be loaded again on access.
+        """
+        feeds = []
+        data = (
+            select(Feed)
+            .where(
+                Feed.used.is_(True),
+                Feed.available.is_(True),
+                Feed.parser_name != "no parser",
+            )
+            .order_by(Feed.name)
+        )
+        for feed in self.session.scalars(data):
+            self.feed_names.append(feed.name)
+            if not self.schedule.is_due(feed.name):
+                continue
+            if feed.parser_name not in ParserByName:
+                print(f"Parser with name {feed.parser_name} not found")
+                continue
+            try:
+                feeds.append((feed.name, feed.id, feed.url,
+                              self.get_validators(feed),
+                              ParserByName[feed.parser_name]))
+            except Exception as e:
+                print(f"ERROR <{feed.name}> {e}")
+        return feeds
+
+    def iter_feeds(self):
+        """
+        Yields (feed name, parse result) as soon as a feed is parsed,
+        so the caller can store its articles while the rest are downloading.
+        At most FEEDS_WORKERS feeds are submitted at a time, the next one
+        after a result is taken, so parsed feeds do not pile up while
+        the caller is busy. Feeds that have not changed are counted but
+        not yielded.
+        """
+        self.feeds_count = 0
         warnings.filterwarnings("ignore", message="Unverified HTTPS request")
         try:
-            data = (
-                select(Feed)
-                .where(
-                    Feed.used == True,
-                    Feed.available == True,
-                    Feed.parser_name != "no parser",
+            feeds = self.due_feeds()
+        except Exception as e:
+            print("ERROR ", e)
+            return
+
+        print("Parsing feeds\n")
+        self.fetched_at = datetime.datetime.now(timezone.utc)
+        feeds = iter(feeds)
+        with ThreadPoolExecutor(max_workers=FEEDS_WORKERS) as executor:
+            futures = {}
+
+            def submit():
+                item = next(feeds, None)
+                if item is None:
+                    return
+                name, feed_id, url, validators, parser = item
+                future = executor.submit(
+                    self.parse_feed, parser, name, url, validators)
+                futures[future] = (name, feed_id, url, validators)
+
+            for _ in range(FEEDS_WORKERS):
+                submit()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, feed_id, url, validators = futures.pop(future)
+                    submit()
+                    try:
+                        rss_raw = future.result()
+                        self.feed_ids[name] = feed_id
+                        self.validators[name] = validators
+                        self.feeds_count += 1
+                        print(f"{name} - id={feed_id}, site: {url}  Ok")
+                    except http_client.NotModified:
+                        self.feed_ids[name] = feed_id
+                        self.validators[name] = validators
+                        self.commit_feed_state(name)
+                        self.feeds_count += 1
+                        print(f"{name} - id={feed_id}, site: {url}"
+                              "  Not modified")
+                        continue
+                    except Exception as e:
+                        self.schedule.update(name, 0, ())
+                        print(f"ERROR <{name}> {e}")
+                        continue
+                    yield name, rss_raw
+                    # drop the finished feed before waiting for the next one
+                    del rss_raw
+
+        print("Done parsing feeds\n")
+
+    def get_feeds(self):
+        """
+        Parse all due feeds into self.rss_raw, returns the number of feeds.
+        """
+        for name, rss_raw in self.iter_feeds():
+            self.rss_raw[name] = rss_raw
+        return self.feeds_count
+
+    def get_existing(self, start_date, end_date, feed_id, urls):
+        """
+        Keys of the feed articles and of the excluded news with the given urls
+        already stored for the date range, loaded once per feed instead of
+        a query per entry. Only the rows the feed entries can match are read.
+        """
+        existing_articles = set(
+            self.session.execute(
+                select(Article.feed_id, Article.title).where(
+                    Article.feed_id == feed_id,
+                    Article.published_parsed >= start_date,
+                    Article.published_parsed <= end_date,
                 )
-                .order_by(Feed.name)
+            ).tuples()
+        )
+        existing_excluded = set()
+        if urls:
+            existing_excluded = set(
+                self.session.execute(
+                    select(
+                        ExcludedFilter.title,
+                        ExcludedFilter.url,
+                        ExcludedFilter.published_parsed,
+                    ).where(
+                        ExcludedFilter.url.in_(urls),
+                        ExcludedFilter.published_parsed >= start_date,
+                        ExcludedFilter.published_parsed <= end_date,
+                    )
+                ).tuples()
             )
-            print("Parsing feeds\n")
-            for feed in self.session.scalars(data):
+        return existing_articles, existing_excluded
+
+    def save_rows(self, batches):
+        """
+        Insert (model, rows) batches with multi-row INSERTs and one commit.
+        Falls back to row by row inserts if the batch fails.
+        Returns the number of inserted rows for every batch
+        and whether all rows were inserted.
+        """
+        if not any(rows for model, rows in batches):
+            return [0 for model, rows in batches], True
+        try:
+            for model, rows in batches:
+                if rows:
+                    self.session.execute(insert(model), rows)
+            self.session.commit()
+            return [len(rows) for model, rows in batches], True
+        except Exception as e:
+            self.session.rollback()
+            print(f"Batch insert failed: {e}")
+
+        saved = []
+        for model, rows in batches:
+            count = 0
+            for row in rows:
                 try:
-                    if feed.parser_name != "no parser":
-                        if feed.parser_name in ParserByName:
-                            parser = ParserByName[feed.parser_name]
-                            feed_cur = parser.parse(feed.url)
-                            self.rss_raw[feed.name] = feed_cur
-                            feeds_count += 1
-                            print(
-                                f"{feed.name} - id={feed.id}, site: {feed.url}  Ok")
+                    self.session.execute(insert(model), [row])
+                    self.session.commit()
+                    count += 1
+                except Exception as e:
+                    self.session.rollback()
+                    print(model.__tablename__, e, row)
+            saved.append(count)
+        all_saved = all(
+            count == len(rows) for count, (model, rows) in zip(saved, batches))
+        return saved, all_saved
+
+    def ingest_feed(self, feed, rss_raw, start_date, end_date, existing):
+        """
+        Filter, deduplicate and store the entries of one parsed feed.
+        existing is the pair of key sets of this run, the stored keys
+        of the feed from get_existing are added to it.
+        Returns the numbers of saved articles and excluded news.
+        """
+        existing_articles, existing_excluded = existing
+        feed_id = self.feed_ids[feed]
+        urls = {
+            entry.link[-2048:] for entry in rss_raw["entries"] if entry.link}
+        feed_articles, feed_excluded = self.get_existing(
+            start_date, end_date, feed_id, urls)
+        existing_articles |= feed_articles
+        existing_excluded |= feed_excluded
+        new_articles = []
+        new_excluded = []
+        published = []
+        for article in rss_raw["entries"]:
+            try:
+                url = article.link
+                id_in_feed = article.id or url
+                id_in_feed = id_in_feed[-400:]
+                title = article.title.replace('"', "")
+                # stored only as plain text which news_text_update can use
+                # as is, an empty body leaves the article to be downloaded
+                body = None
+                if STORE_LISTING_BODY and article.body:
+                    body = soup_builder.html_text(article.body)
+            except Exception as e:
+                print(e)
+                continue
+
+            if article.published:
+                published_parsed = article.published
+                if published_parsed.month == 1:
+                    if is_leap_year(published_parsed.year):
+                        nums_days = 29
+                else:
+                    nums_days = month_days[published_parsed.month - 1]
+
+                if (
+                    published_parsed.hour >= 21
+                    and published_parsed.day == nums_days
+                ):
+                    published_parsed = published_parsed.replace(
+                        hour=20)
+                published.append(published_parsed)
+            else:
+                published_parsed = datetime.datetime.now(
+                    tz=pytz.timezone("UTC")
+                )
+
+            try:
+                # Фильтр в диапазоне дат
+                if start_date <= published_parsed <= end_date:
+                    # Фильтр по стоп-словам
+                    if check_stop_words(title):
+                        # проверка наличия новости
+                        article_key = (feed_id, title)
+                        if (article_key not in existing_articles
+                                and title.find('Ð') < 0):
+                            existing_articles.add(article_key)
+                            new_articles.append(
+                                dict(
+                                    id_in_feed=id_in_feed,
+                                    url=url[-2048:],
+                                    title=title,
+                                    # title_json=None,
+                                    is_entities_parsed=False,
+                                    feed_id=feed_id,
+                                    published_parsed=published_parsed,
+                                    is_text_parsed=False,
+                                    text=body or None,
+                                )
+                            )
                         else:
-                            print(
-                                f"Parser with name {feed.parser_name} not found")
                             continue
                     else:
-                        continue
-                except Exception as e:
-                    print(f"ERROR <{feed.name}> {e}")
-        except Exception as e:
-            print("ERROR ", feed.name, e)
-
-        print("Done parsing feeds\n")
-        return feeds_count
+                        excluded_key = (title, url[-2048:], published_parsed)
+                        if excluded_key not in existing_excluded:
+                            existing_excluded.add(excluded_key)
+                            new_excluded.append(
+                                dict(
+                                    title=title,
+                                    url=url[-2048:],
+                                    published_parsed=published_parsed,
+                                ))
+                        else:
+                            continue
+                else:
+                    continue
+            except Exception as e:
+                print(feed, e, article)
+        (new_articles_count, news_excluded), saved = self.save_rows(
+            [(Article, new_articles), (ExcludedFilter, new_excluded)])
+        print(new_articles_count)
+        if not saved:
+            print(f"{feed}: not all entries saved, validators are not updated")
+        # unsaved entries count as new so the feed is retried soon,
+        # not backed off
+        new_count = new_articles_count if saved else len(new_articles)
+        self.commit_feed_state(feed, new_count, published, saved)
+        return new_articles_count, news_excluded
 
     def get_articles(self):
         """
         Update feeds article data.
+        Articles of every feed are stored as soon as the feed is parsed.
         """
         # Добавлен фильтр в диапазоне дат  месяц
         start_date = self.get_datetime(-DELTA_DATE_ARTICLE)
         end_date = self.get_datetime(1)
 
-        feeds_count = self.get_feeds()
-
-        if feeds_count > 0:
-            count_news = 0
-            count_news_excluded=0
-            try:
-                for feed in self.rss_raw:
-                    print(feed)
-                    new_articles_count=0
-                    news_excluded=0
-                    for article in self.rss_raw[feed]["entries"]:
-                        if article:
-                            feed_name = feed
-                            feed_id = self.session.scalars(
-                                select(Feed.id).where(Feed.name == feed_name)
-                            ).first()
-
-                            try:
-                                if feed in ["rbc", "aif"]:
-                                    url = article["links"][0]["href"]
-                                else:
-                                    url = article["link"]
-
-                                id_in_feed = article.get("id", url)
-
-                                if not id_in_feed:
-                                    id_in_feed = url
-                                id_in_feed = id_in_feed[-400:]
-                                title = article["title"]
-                                title = title.replace('"', "")
-                            except Exception as e:
-                                print(e)
-                                continue
-
-                            if article.get("published_parsed"):
-                                published_parsed = datetime.datetime.fromtimestamp(
-                                    mktime(article["published_parsed"]),
-                                    tz=pytz.timezone("UTC"),
-                                )
-                                if published_parsed.month == 1:
-                                    if is_leap_year(published_parsed.year):
-                                        nums_days = 29
-                                else:
-                                    nums_days = month_days[published_parsed.month - 1]
-
-                                if (
-                                    published_parsed.hour >= 21
-                                    and published_parsed.day == nums_days
-                                ):
-                                    published_parsed = published_parsed.replace(
-                                        hour=20)
-                            else:
-                                published_parsed = datetime.datetime.now(
-                                    tz=pytz.timezone("UTC")
-                                )
-
-                            try:
-                                # Фильтр в диапазоне дат
-                                if (published_parsed >= start_date and published_parsed <= end_date):
-                                    # Фильтр по стоп-словам
-                                    if check_stop_words(title):    
-                                            #проверка наличия новости
-                                            new_article = self.session.scalars(
-                                                select(Article).where(
-                                                    Article.feed_id == feed_id,
-                                                    # Article.id_in_feed == id_in_feed,
-                                                    # Article.url == url,
-                                                    Article.title == title,
-                                                    Article.published_parsed >= start_date,
-                                                    Article.published_parsed <= end_date,
-                                                )
-                                            )
-                                            if not new_article.first() and title.find('Ð') < 0: 
-                                                self.session.add(
-                                                    Article(
-                                                        id_in_feed=id_in_feed,
-                                                        url=url[-2048:],
-                                                        title=title,
-                                                        # title_json=None,
-                                                        is_entities_parsed=False,
-                                                        feed_id=feed_id,
-                                                        published_parsed=published_parsed,
-                                                        is_text_parsed=False,
-                                                    )
-                                                )
-                                                new_articles_count += 1
-                                            else:
-                                                continue
-                                    else: 
-                                        exlcude_news = self.session.scalars(
-                                            select(ExcludedFilter).where(
-                                            ExcludedFilter.title==title,
-                                            ExcludedFilter.published_parsed==published_parsed,
-                                            ExcludedFilter.url==url,
-                                            ))
-                                        if not exlcude_news.first():
-                                            self.session.add(
-                                                ExcludedFilter(
-                                                title=title,
-                                                url=url[-2048:],
-                                                published_parsed=published_parsed,
-                                                ))
-                                            news_excluded+=1
-                                            
-                                        else:
-                                            continue
-                                else:
-                                    continue
-                                self.session.commit()
-                            except Exception as e:
-                                self.session.rollback()
-                                print(feed, e, article)
-                    print(new_articles_count)
-                    count_news = count_news + new_articles_count
-                    count_news_excluded= count_news_excluded +news_excluded
-            finally:
+        existing = (set(), set())
+        count_news = 0
+        count_news_excluded = 0
+        try:
+            for feed, rss_raw in self.iter_feeds():
+                print(feed)
+                new_articles_count, news_excluded = self.ingest_feed(
+                    feed, rss_raw, start_date, end_date, existing)
+                count_news = count_news + new_articles_count
+                count_news_excluded = count_news_excluded + news_excluded
+        finally:
+            self.save_feed_state()
+            if self.feeds_count > 0:
                 print("*" * 80)
-                print(f"Searched {feeds_count} news sites and rss feeds")
+                print(f"Searched {self.feeds_count} news sites and rss feeds")
                 print(
-                    f"{count_news} news added to the table newsfeedner_article for the current session."
+                    f"{count_news} news added to the table newsfeedner_article"
+                    " for the current session."
                 )
                 print(
-                    f"{count_news_excluded} excluded by filter for the current session."
+                    f"{count_news_excluded} excluded by filter"
+                    " for the current session."
                 )
+                for name, info in cache_stats().items():
+                    print(f"Filter {name} cache: hits={info.hits},"
+                          f" misses={info.misses}, size={info.currsize}")
+                for name, info in dates.cache_stats().items():
+                    print(f"Date {name} cache: hits={info.hits},"
+                          f" misses={info.misses}, size={info.currsize}")
         self.session.close()
+
+    def sleep_time(self):
+        """
+        Seconds until the next feed is due.
+        """
+        return self.schedule.sleep_time(self.feed_names)
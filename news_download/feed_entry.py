@@ -0,0 +1,43 @@
+import datetime
+from typing import NamedTuple, Optional
+
+import dates
+
+
+class FeedEntry(NamedTuple):
+    """
+    One news item of a feed listing, what every parser returns in "entries".
+    published is a timezone-aware datetime, None if the site gives no date.
+    """
+
+    id: Optional[str]
+    title: str
+    link: str
+    published: Optional[datetime.datetime]
+    body: Optional[str] = None
+
+
+def entries_from_feedparser(entries, link_from_links=False, body_from_summary=False):
+    """
+    FeedEntry records from feedparser entries.
+    link_from_links takes the link from the first of entry links,
+    body_from_summary keeps the summary as the article text.
+    """
+    result = []
+    for entry in entries:
+        try:
+            if link_from_links:
+                link = entry["links"][0]["href"]
+            else:
+                link = entry["link"]
+            published = entry.get("published_parsed")
+            result.append(FeedEntry(
+                id=entry.get("id"),
+                title=entry["title"],
+                link=link,
+                published=dates.to_datetime(published) if published else None,
+                body=entry.get("summary") if body_from_summary else None,
+            ))
+        except Exception as e:
+            print(e)
+    return result
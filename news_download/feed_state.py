@@ -0,0 +1,43 @@
+import json
+import os
+
+from config import FEED_STATE_PATH
+
+
+class FeedState:
+    """
+    Per feed values kept between runs in a json file,
+    e.g. ETag and Last-Modified of the feed listing.
+    """
+
+    def __init__(self, path=FEED_STATE_PATH):
+        self.path = path
+        self.feeds = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Feed state {self.path} not loaded: {e}")
+            return {}
+
+    def get(self, name):
+        return dict(self.feeds.get(name, {}))
+
+    def update(self, name, values):
+        self.feeds.setdefault(name, {}).update(values)
+
+    def save(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.feeds, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Feed state {self.path} not saved: {e}")
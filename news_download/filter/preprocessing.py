@@ -1,7 +1,7 @@
+import os
 import pymorphy2
 import re
-import nltk
-from nltk.corpus import stopwords
+from functools import lru_cache
 
 list_words = [
     'telegram',
@@ -335,11 +335,17 @@ list_words = [
     'wagner',  
 ]
 
-nltk.download('stopwords')
-# stopwords = nltk.download('stopwords')
+# stopwords are a snapshot of the NLTK corpus stored in filter/stopwords,
+# set NLTK_STOPWORDS_DOWNLOAD=1 to download the current NLTK lists instead
+STOPWORDS_DIR = os.path.join(os.path.dirname(__file__), 'stopwords')
+STOPWORDS_LANGUAGES = ('russian', 'english')
+NLTK_STOPWORDS_DOWNLOAD = os.getenv('NLTK_STOPWORDS_DOWNLOAD') == '1'
 
 morph = pymorphy2.MorphAnalyzer()
 
+# the same titles are checked every run because of the DELTA_DATE_ARTICLE window
+LEMMA_CACHE_SIZE = 100000
+TITLE_CACHE_SIZE = 20000
 
 words_regex = re.compile('\w+')
 
@@ -349,11 +355,35 @@ def find_words(text, regex=words_regex):
     return [w for w in tokens if w.isalpha() and len(w) >= 3]
 
 
-stopwords_list = stopwords.words('russian') + stopwords.words('english')
+@lru_cache(maxsize=None)
+def load_stopwords(languages=STOPWORDS_LANGUAGES):
+    words = []
+    if NLTK_STOPWORDS_DOWNLOAD:
+        import nltk
+        nltk.download('stopwords')
+        from nltk.corpus import stopwords
+        for language in languages:
+            words += stopwords.words(language)
+    else:
+        for language in languages:
+            path = os.path.join(STOPWORDS_DIR, language)
+            with open(path, encoding='utf-8') as f:
+                words += f.read().split()
+    return frozenset(words)
 
 
-def lemmatize(words, lemmer=morph, stopwords=stopwords_list):
-    lemmas = [lemmer.parse(w)[0].normal_form for w in words]
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemma(word):
+    return morph.parse(word)[0].normal_form
+
+
+def lemmatize(words, lemmer=morph, stopwords=None):
+    if stopwords is None:
+        stopwords = load_stopwords()
+    if lemmer is morph:
+        lemmas = [lemma(w) for w in words]
+    else:
+        lemmas = [lemmer.parse(w)[0].normal_form for w in words]
     return [w for w in lemmas if not w in stopwords
             and w.isalpha()]
 
@@ -361,8 +391,41 @@ def lemmatize(words, lemmer=morph, stopwords=stopwords_list):
 def preprocess(text):
     return (lemmatize(find_words(text)))
 
+
+class StopWordMatcher:
+    """
+    Checks titles against a list of stop words.
+    Word sets are built once, verdicts are cached by title.
+    check(title) returns False if the title contains a stop word.
+    """
+
+    def __init__(self, words, stopwords=None, cache_size=TITLE_CACHE_SIZE):
+        self.words = frozenset(words)
+        self.stopwords = frozenset(stopwords) if stopwords is not None else None
+        self.check = lru_cache(maxsize=cache_size)(self._check)
+
+    def _check(self, title):
+        if self.stopwords is None:
+            self.stopwords = load_stopwords()
+        lemmas = (lemma(w) for w in find_words(title))
+        return self.words.isdisjoint(
+            w for w in lemmas if w not in self.stopwords and w.isalpha())
+
+    def check_many(self, titles):
+        return [self.check(title) for title in titles]
+
+
+matcher = StopWordMatcher(list_words)
+
+
 def check_stop_words(title, words=list_words):
-    title = set(preprocess(title))
-    if title.intersection(set(words)):
-        return False
-    return True
+    if words is list_words:
+        return matcher.check(title)
+    return StopWordMatcher(words).check(title)
+
+
+def cache_stats():
+    return {
+        "lemma": lemma.cache_info(),
+        "title": matcher.check.cache_info(),
+    }
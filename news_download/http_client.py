@@ -0,0 +1,174 @@
+"""
+HTTP session for the feed parsers of news_download.
+Connections are kept alive and pooled per host, failed GET requests
+are retried with exponential backoff. Feed listings can be requested
+conditionally, see conditional().
+"""
+import contextlib
+import hashlib
+import random
+import threading
+import urllib.parse
+
+import requests
+from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (HTTP_BACKOFF, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+                    HTTP_RETRIES, HTTP_TIMEOUT, USER_AGENT_POOL_SIZE)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+_conditional = threading.local()
+
+
+class NotModified(Exception):
+    """
+    The server answered 304 to a conditional request
+    or sent the same body as the last time.
+    """
+
+
+def make_session(pool_connections=HTTP_POOL_CONNECTIONS,
+                 pool_maxsize=HTTP_POOL_MAXSIZE,
+                 retries=HTTP_RETRIES,
+                 backoff=HTTP_BACKOFF):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        # POST is not idempotent, e.g. a repeated sentiment request
+        allowed_methods=frozenset(["HEAD", "GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def request(method, url, **kwargs):
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    validators = getattr(_conditional, "validators", None)
+    if validators is None or method != "GET":
+        return get_session().request(method, url, **kwargs)
+
+    _conditional.validators = None
+    headers = dict(kwargs.get("headers") or {})
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    kwargs["headers"] = headers
+    r = get_session().request(method, url, **kwargs)
+    if r.status_code == 304:
+        raise NotModified(url)
+    if r.status_code == 200:
+        validators["etag"] = r.headers.get("ETag")
+        validators["last_modified"] = r.headers.get("Last-Modified")
+        # for sites which send no validators or change them on every request
+        content_hash = hashlib.sha1(r.content).hexdigest()
+        if content_hash == validators.get("hash"):
+            raise NotModified(url)
+        validators["hash"] = content_hash
+    return r
+
+
+@contextlib.contextmanager
+def conditional(validators):
+    """
+    Makes the first GET request of the block in this thread conditional.
+    validators is a dict with "etag" and "last_modified" values sent as
+    If-None-Match and If-Modified-Since and the "hash" of the last body,
+    it is updated from a 200 response. NotModified is raised if the server
+    answers 304 or the body has the same hash.
+    """
+    _conditional.validators = validators
+    try:
+        yield validators
+    finally:
+        _conditional.validators = None
+
+
+class HostLimiter:
+    """
+    Limits the number of simultaneous requests to the same host.
+    """
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def get(self, url):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(
+                    self.per_host)
+            return self.semaphores[host]
+
+
+class UserAgentProvider:
+    """
+    Random User-Agent strings.
+    fake_useragent data is loaded once on first use and a pool of strings
+    is kept in memory. Pass user_agents to pin the values, e.g. in tests.
+    """
+
+    def __init__(self, pool_size=USER_AGENT_POOL_SIZE, user_agents=None):
+        self.pool_size = pool_size
+        self.user_agents = list(user_agents) if user_agents else None
+        self.lock = threading.Lock()
+
+    def load(self):
+        ua = UserAgent()
+        return list({ua.random for _ in range(self.pool_size)})
+
+    def random(self):
+        if self.user_agents is None:
+            with self.lock:
+                if self.user_agents is None:
+                    self.user_agents = self.load()
+        return random.choice(self.user_agents)
+
+
+_user_agents = UserAgentProvider()
+
+
+def set_user_agent_provider(provider):
+    global _user_agents
+    _user_agents = provider
+
+
+def random_user_agent():
+    return _user_agents.random()
+
+
+def ua_headers():
+    return {"User-Agent": random_user_agent()}
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -1,6 +1,6 @@
 import time
 import datetime
-from config import get_time, DOWNLOAD_ARTICLE_SLEEP
+from config import get_time
 from download_article import FeedDownloader
 
 if __name__ == '__main__':
@@ -14,6 +14,7 @@ if __name__ == '__main__':
         endtime = time.time()
         print(f'Service worked {(endtime-starttime)//60} min')
         print('*'*80 + '\n' + 'Done get_articles()' + '\n' + '*'*80)
-        print(f' Sleeping for {DOWNLOAD_ARTICLE_SLEEP//60}  min')
+        sleep_time = downloader.sleep_time()
+        print(f' Sleeping for {int(sleep_time)//60}  min')
         print('='*80)
-        time.sleep(DOWNLOAD_ARTICLE_SLEEP)
+        time.sleep(sleep_time)
@@ -0,0 +1,78 @@
+import time
+
+from config import DOWNLOAD_ARTICLE_SLEEP, FEED_MAX_INTERVAL, FEED_MIN_INTERVAL
+
+# the interval of a feed without new articles grows by this factor
+BACKOFF = 1.5
+# publications older than this are not used for the publish rate, seconds
+RATE_WINDOW = 7 * 24 * 3600
+# shortest sleep between two runs of the downloader, seconds
+MIN_SLEEP = 60
+
+
+class FeedSchedule:
+    """
+    Next fetch time of every feed, kept in FeedState.
+    A feed with new articles is fetched twice as often, a feed without them
+    BACKOFF times less often but not less often than it publishes on average.
+    Intervals stay within min_interval..max_interval seconds, a feed without
+    history is due at once.
+    """
+
+    def __init__(self, feed_state, min_interval=FEED_MIN_INTERVAL,
+                 max_interval=FEED_MAX_INTERVAL,
+                 start_interval=DOWNLOAD_ARTICLE_SLEEP):
+        self.feed_state = feed_state
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.start_interval = start_interval
+
+    def is_due(self, name, now=None):
+        now = now or time.time()
+        return self.feed_state.get(name).get("next_fetch", 0) <= now
+
+    def publish_gap(self, published, now):
+        """
+        Average time between the feed publications, None if unknown.
+        """
+        times = sorted(
+            p.timestamp() for p in published
+            if now - RATE_WINDOW <= p.timestamp() <= now
+        )
+        if len(times) < 2:
+            return None
+        return (times[-1] - times[0]) / (len(times) - 1)
+
+    def update(self, name, new_count, published, now=None):
+        """
+        Plan the next fetch of the feed after a fetch
+        with new_count new articles and entries published at published.
+        """
+        now = now or time.time()
+        values = self.feed_state.get(name)
+        interval = values.get("interval", self.start_interval)
+        if new_count:
+            interval /= 2
+        else:
+            interval *= BACKOFF
+        gap = self.publish_gap(published, now) or values.get("gap")
+        if gap:
+            interval = min(interval, gap)
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        self.feed_state.update(name, {
+            "interval": interval,
+            "next_fetch": now + interval,
+            "gap": gap,
+        })
+
+    def sleep_time(self, names, now=None):
+        """
+        Seconds until the first of the feeds is due,
+        from MIN_SLEEP up to start_interval.
+        """
+        now = now or time.time()
+        next_fetch = min(
+            (self.feed_state.get(name).get("next_fetch", 0) for name in names),
+            default=now + self.start_interval,
+        )
+        return min(max(next_fetch - now, MIN_SLEEP), self.start_interval)
@@ -0,0 +1,18 @@
+"""
+config.py reads these variables from the docker compose .env file,
+the defaults let the tests run without it. No database is used.
+"""
+import os
+
+ENV_DEFAULTS = {
+    "DELTA_DATE_ARTICLE": "1",
+    "DELTA_DATE_TEXT": "1",
+    "DOWNLOAD_ARTICLE_SLEEP": "60",
+    "DOWNLOAD_TEXT_SLEEP": "30",
+    # the engine is created but never connected
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+}
+
+for name, value in ENV_DEFAULTS.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,48 @@
+"""
+Micro-benchmark of the dates module against the per-parser code it replaced.
+Run from news_download: python -m tests.benchmark_dates [repeat] [per_day]
+The corpus is the date strings of the test cases, each repeated per_day
+times like a listing page repeats the day of its news. "cold" clears the
+caches before every run, "warm" keeps them as between feed updates.
+"""
+import sys
+import timeit
+
+import dates
+from tests.test_dates import date_cases
+
+CACHED = [dates.strptime, dates.replace_ru_month, dates.day_month_year,
+          dates.month_year, dates.relative_seconds]
+
+
+def clear_caches():
+    for func in CACHED:
+        func.cache_clear()
+
+
+def main(repeat=20, per_day=30):
+    corpus = [case for case in date_cases() for _ in range(per_day)]
+    print(f"{len(corpus)} dates, {repeat} runs")
+
+    def reference():
+        return [ref(*args) for func, args, ref, expected in corpus]
+
+    def parse():
+        return [func(*args) for func, args, ref, expected in corpus]
+
+    def parse_cold():
+        clear_caches()
+        return parse()
+
+    results = {}
+    for name, run in [("reference", reference), ("dates cold", parse_cold),
+                      ("dates warm", parse)]:
+        seconds = min(timeit.repeat(run, number=1, repeat=repeat))
+        results[name] = seconds
+        print(f"{name}: {seconds / len(corpus) * 1e6:.2f} us per date")
+    for name in ("dates cold", "dates warm"):
+        print(f"{name} speedup: {results['reference'] / results[name]:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
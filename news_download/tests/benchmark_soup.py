@@ -0,0 +1,60 @@
+"""
+Micro-benchmark of the listing parsers on the fixture pages:
+html.parser with the full tree (before the strainers), lxml with the full
+tree and lxml with the parser strainers (what soup_builder does now).
+Run from news_download: python -m tests.benchmark_soup [repeat] [filler]
+The fixtures are small, filler blocks of markup no strainer keeps are
+added before </body> to make pages of the size of the real listings.
+"""
+import sys
+import timeit
+
+from tests.test_listing_parsers import (
+    LISTINGS, FixtureResponse, parse_listing, read_listing)
+
+FILLER_BLOCK = (
+    '<div class="sidebar-block"><ul>'
+    '<li><a href="/tag/economy/">Экономика</a></li>'
+    '<li><a href="/tag/trade/">Торговля</a></li>'
+    '</ul><p>Реклама <span>и</span> ссылки на другие разделы сайта</p>'
+    '<script>window.dataLayer = window.dataLayer || [];</script></div>\n'
+)
+
+MODES = [
+    ("html.parser", False),
+    ("lxml", False),
+    ("lxml", True),
+]
+
+
+def padded_response(name, filler):
+    response = read_listing(name)
+    text = response.text.replace("</body>", FILLER_BLOCK * filler + "</body>")
+    return FixtureResponse(text.encode("utf-8"))
+
+
+def main(repeat=5, filler=300):
+    responses = {name: padded_response(name, filler) for name in LISTINGS}
+    size = sum(len(r.content) for r in responses.values())
+    print(f"{len(responses)} pages, {size // 1024} KiB, {repeat} runs")
+
+    def run(features, strain):
+        return [parse_listing(name, features, strain, response)["entries"]
+                for name, response in responses.items()]
+
+    expected = run("html.parser", False)
+    for features, strain in MODES:
+        assert run(features, strain) == expected
+
+    results = {}
+    for features, strain in MODES:
+        label = f"{features}{' + strainer' if strain else ''}"
+        seconds = min(timeit.repeat(
+            lambda: run(features, strain), number=1, repeat=repeat))
+        results[label] = seconds
+        print(f"{label}: {seconds / len(responses) * 1e3:.2f} ms per page")
+    print(f"speedup: {results['html.parser'] / results['lxml + strainer']:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
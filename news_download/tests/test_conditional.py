@@ -0,0 +1,75 @@
+import datetime
+import types
+import unittest
+from unittest import mock
+
+import download_article
+import http_client
+
+FEED_URL = "https://example.com/rss"
+
+
+class FakeSession:
+    """
+    Answers every request with status and body, keeps the request headers.
+    """
+
+    def __init__(self, status_code=200, content=b"<rss></rss>", headers=None):
+        self.response = types.SimpleNamespace(
+            status_code=status_code, content=content, headers=headers or {})
+        self.headers = []
+
+    def request(self, method, url, **kwargs):
+        self.headers.append(kwargs.get("headers") or {})
+        return self.response
+
+
+def conditional_get(session, validators):
+    with mock.patch.object(http_client, "get_session", return_value=session), \
+            http_client.conditional(validators):
+        return http_client.get(FEED_URL)
+
+
+class ConditionalRequestTest(unittest.TestCase):
+    """
+    A feed is requested with the validators its site sent before only.
+    """
+
+    def setUp(self):
+        self.downloader = download_article.FeedDownloader()
+        self.downloader.feed_state.feeds = {}
+        self.feed = types.SimpleNamespace(
+            name="feed",
+            last_fetched_at=datetime.datetime(2022, 5, 18, tzinfo=datetime.timezone.utc))
+
+    def test_no_last_fetched_at_as_if_modified_since(self):
+        session = FakeSession()
+        validators = self.downloader.get_validators(self.feed)
+        conditional_get(session, validators)
+        self.assertNotIn("If-Modified-Since", session.headers[0])
+        self.assertNotIn("If-None-Match", session.headers[0])
+
+    def test_stored_validators_are_sent(self):
+        self.downloader.feed_state.update("feed", {
+            "etag": '"abc"', "last_modified": "Wed, 18 May 2022 10:00:00 GMT"})
+        session = FakeSession()
+        conditional_get(session, self.downloader.get_validators(self.feed))
+        self.assertEqual(session.headers[0]["If-None-Match"], '"abc"')
+        self.assertEqual(
+            session.headers[0]["If-Modified-Since"], "Wed, 18 May 2022 10:00:00 GMT")
+
+    def test_same_body_by_hash(self):
+        session = FakeSession()
+        validators = self.downloader.get_validators(self.feed)
+        conditional_get(session, validators)
+        self.downloader.feed_state.update("feed", validators)
+        with self.assertRaises(http_client.NotModified):
+            conditional_get(session, self.downloader.get_validators(self.feed))
+
+    def test_not_modified(self):
+        with self.assertRaises(http_client.NotModified):
+            conditional_get(FakeSession(status_code=304), {"etag": '"abc"'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import datetime
+import re
+import time
+import unittest
+
+import pytz
+
+import dates
+
+UTC = datetime.timezone.utc
+MSK = pytz.timezone("Europe/Moscow")
+MONTSAME_UNITS = (("д", 24 * 60 * 60), ("ч", 60 * 60), ("м", 60), ("с", 1))
+
+# month names in the forms the sites write them, with the month number
+GENITIVE_MONTHS = [
+    ("января", 1), ("февраля", 2), ("марта", 3), ("апреля", 4),
+    ("мая", 5), ("июня", 6), ("июля", 7), ("августа", 8),
+    ("сентября", 9), ("октября", 10), ("ноября", 11), ("декабря", 12),
+]
+NOMINATIVE_MONTHS = [
+    ("январь", 1), ("февраль", 2), ("март", 3), ("апрель", 4),
+    ("май", 5), ("июнь", 6), ("июль", 7), ("август", 8),
+    ("сентябрь", 9), ("октябрь", 10), ("ноябрь", 11), ("декабрь", 12),
+]
+
+
+# the per-parser code the dates module replaced, struct_time results
+
+
+def reference_ru_date(text, fmt):
+    for m in dates.ru_month_dict:
+        if m in text:
+            pattern = f"{m}\\w?"
+            text = re.sub(pattern, dates.ru_month_dict[m], text)
+            break
+    text = re.sub(r"\s{2,}", " ", text)
+    return datetime.datetime.strptime(text, fmt).timetuple()
+
+
+def reference_day_month_year(text, with_time=False, lower=True):
+    parts = text.split(" ")
+    month = parts[1].lower() if lower else parts[1]
+    date = parts[2] + "." + dates.Monats[month] + "." + parts[0]
+    if with_time:
+        return time.strptime(date + " " + parts[3], "%Y.%m.%d %H:%M")
+    return time.strptime(date, "%Y.%m.%d")
+
+
+def reference_month_year(text):
+    text = text.lower()
+    year = re.findall(r"20\d\d", text)[0]
+    for m in dates.ru_month_dict:
+        if re.findall(m, text):
+            month = dates.ru_month_dict[m]
+            break
+    else:
+        raise ValueError(f"no month in {text}")
+    return datetime.datetime.strptime(f"{year}.{month}.01", "%Y.%m.%d").timetuple()
+
+
+def reference_relative_day(text, now, units):
+    value, measure = re.findall(r"(\d+) (\w+)", text)[0]
+    measure = measure.lower()
+    seconds = 0
+    for prefix, unit in units:
+        if measure.startswith(prefix):
+            seconds = int(value) * unit
+            break
+    date = now - datetime.timedelta(seconds=seconds)
+    date = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    return date.timetuple()
+
+
+def wall_clock(struct):
+    # how the struct_time was stored: fromtimestamp(mktime()) with TZ=UTC
+    return datetime.datetime(*struct[:6], tzinfo=UTC)
+
+
+def date_cases():
+    """
+    (function, arguments, reference function, expected) for every date
+    format of the parsers, the listing fixtures and all month names.
+    """
+    cases = []
+    for name, month in GENITIVE_MONTHS:
+        expected = datetime.datetime(2022, month, 11, tzinfo=UTC)
+        cases.append((dates.ru_date, (f"11 {name} 2022", "%d %m %Y"),
+                      reference_ru_date, expected))
+        cases.append((dates.day_month_year, (f"11 {name} 2022",),
+                      reference_day_month_year, expected))
+        cases.append((dates.day_month_year, (f"11 {name.title()} 2022",),
+                      reference_day_month_year, expected))
+        cases.append((dates.day_month_year, (f"11 {name} 2022 10:00", True, False),
+                      reference_day_month_year, expected.replace(hour=10)))
+    for name, month in NOMINATIVE_MONTHS:
+        expected = datetime.datetime(2021, month, 1, tzinfo=UTC)
+        cases.append((dates.month_year, (f"Статья, {name.title()} 2021",),
+                      reference_month_year, expected))
+    cases += [
+        # Milknews after "г." is replaced
+        (dates.ru_date, ("18 мая 2022   10:00", "%d %m %Y %H:%M"),
+         reference_ru_date, datetime.datetime(2022, 5, 18, 10, tzinfo=UTC)),
+        # Argus, JapanNews with the spaces of the page
+        (dates.ru_date, ("2  марта  2023", "%d %m %Y"),
+         reference_ru_date, datetime.datetime(2023, 3, 2, tzinfo=UTC)),
+        (dates.ru_date, ("1 май 2022", "%d %m %Y"),
+         reference_ru_date, datetime.datetime(2022, 5, 1, tzinfo=UTC)),
+    ]
+    return cases
+
+
+class DatesTest(unittest.TestCase):
+    """
+    The dates module gives the same wall-clock time as the per-parser
+    code it replaced, as aware datetimes in UTC.
+    """
+
+    def test_formats(self):
+        for func, args, reference, expected in date_cases():
+            with self.subTest(func=func.__name__, args=args):
+                result = func(*args)
+                self.assertEqual(result, expected)
+                self.assertIs(result.tzinfo, UTC)
+                self.assertEqual(result, wall_clock(reference(*args)))
+
+    def test_month_tables(self):
+        numbers = [f"{i:02d}" for i in range(1, 13)]
+        self.assertEqual(sorted(dates.Monats.values()), numbers)
+        self.assertEqual(sorted(dates.short_months.values()), numbers)
+        self.assertEqual(sorted(set(dates.ru_month_dict.values())), numbers)
+        for name, month in NOMINATIVE_MONTHS:
+            # MetalBulletin: "18 мар. 2022"
+            self.assertEqual(dates.short_months[name[:3]], f"{month:02d}")
+        for name, month in GENITIVE_MONTHS + NOMINATIVE_MONTHS:
+            with self.subTest(month=name):
+                self.assertEqual(
+                    dates.replace_ru_month(f"5 {name} 2022"), f"5 {month:02d} 2022")
+
+    def test_strptime(self):
+        self.assertEqual(
+            dates.strptime("2022-05-18 13:01", "%Y-%m-%d %H:%M"),
+            datetime.datetime(2022, 5, 18, 13, 1, tzinfo=UTC))
+        self.assertEqual(
+            dates.first_strptime("18.05.2022", ("%d.%m.%Y %H:%M", "%d.%m.%Y")),
+            datetime.datetime(2022, 5, 18, tzinfo=UTC))
+        self.assertEqual(
+            dates.first_strptime("18.05.2022 10:30", ("%d.%m.%Y %H:%M", "%d.%m.%Y")),
+            datetime.datetime(2022, 5, 18, 10, 30, tzinfo=UTC))
+        with self.assertRaises(ValueError):
+            dates.first_strptime("18 May", ("%d.%m.%Y %H:%M", "%d.%m.%Y"))
+
+    def test_month_year_without_month(self):
+        with self.assertRaises(ValueError):
+            dates.month_year("Статья, 2022")
+
+    def test_relative_day(self):
+        # Montsame: "5 ч" at 03:00 in Moscow is the day before
+        now = MSK.localize(datetime.datetime(2022, 5, 18, 3, 0))
+        for text, day in [("5 ч", 17), ("30 м", 18), ("2 д", 16), ("10 с", 18),
+                          ("3 недели", 18)]:
+            with self.subTest(text=text):
+                result = dates.relative_day(text, now, MONTSAME_UNITS)
+                self.assertEqual(result, datetime.datetime(2022, 5, day, tzinfo=UTC))
+                self.assertEqual(
+                    result, wall_clock(reference_relative_day(text, now, MONTSAME_UNITS)))
+
+    def test_to_datetime(self):
+        expected = datetime.datetime(2022, 5, 18, 13, 1, 51, tzinfo=UTC)
+        # feedparser published_parsed is UTC struct_time
+        self.assertEqual(dates.to_datetime(time.gmtime(expected.timestamp())), expected)
+        self.assertEqual(dates.to_datetime(expected.replace(tzinfo=None)), expected)
+        msk = expected.astimezone(MSK)
+        self.assertEqual(dates.to_datetime(msk), expected)
+        self.assertIs(dates.to_datetime(msk).tzinfo, UTC)
+
+
+if __name__ == "__main__":
+    unittest.main()
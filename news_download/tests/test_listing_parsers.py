@@ -0,0 +1,136 @@
+import datetime
+import json
+import os
+import unittest
+from unittest import mock
+
+from bs4 import BeautifulSoup
+
+import download_article
+import soup_builder
+
+LISTINGS_DIR = os.path.join(os.path.dirname(__file__), "data", "listings")
+# links and published dates (UTC, wall-clock time of the site) of the fixtures
+PUBLISHED_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "listings_published.json")
+
+# parser class in download_article: (fixture file, feed url)
+LISTINGS = {
+    "AfricabusinesscommunitiesParser": (
+        "africabusiness.html", "https://africabusinesscommunities.com/news/"),
+    "AfricanewsParser": ("africanews.html", "https://www.africanews.com/news/"),
+    "APKInformParser": ("apkinform.html", "https://www.apk-inform.com/en/news"),
+    "ArgusParser": ("argus.html", "https://www.argusmedia.com/ru/news"),
+    "CDUParser": ("cdu.html", "https://www.cdu.ru/tek_russia/articles"),
+    "EaeunionParser": ("eaeunion.html", "https://eec.eaeunion.org/news/"),
+    "ExportcenterParser": (
+        "exportcenter.html", "https://www.exportcenter.ru/press_center/"),
+    "MetalBulletinParser": (
+        "metalbulletin.html", "https://www.metalbulletin.ru/news/"),
+    "MilknewsParser": ("milknews.html", "https://milknews.ru/index/"),
+    "MinEconDevelParser": (
+        "minecondevel.html", "https://economy.gov.ru/material/news/"),
+    "MinTransParser": ("mintrans.html", "https://mintrans.gov.ru/press-center/news"),
+    "MinVRParser": ("minvr.html", "https://minvr.gov.ru/press-center/news/"),
+    "MofcomParser": (
+        "mofcom.html",
+        "http://english.mofcom.gov.cn/article/newsrelease/significantnews/"),
+    "NuzParser": ("nuz.html", "https://nuz.uz/feed"),
+    "PortNews": ("portnews.html", "https://portnews.ru/news"),
+    "ThedticParser": (
+        "thedtic.html",
+        "http://www.thedtic.gov.za/category/the-dti-archives/media-room/media-statements/"),
+}
+
+# (features, parse_only is used) of the soups compared with the full lxml tree
+SOUP_MODES = [("lxml", True), ("html.parser", False), ("html.parser", True)]
+
+
+class FixtureResponse:
+    def __init__(self, content):
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.status_code = 200
+
+
+def read_listing(name):
+    with open(os.path.join(LISTINGS_DIR, LISTINGS[name][0]), "rb") as f:
+        return FixtureResponse(f.read())
+
+
+def soup_factory(features, strain):
+    def make_soup(markup, parse_only=None):
+        return BeautifulSoup(
+            markup, features=features, parse_only=parse_only if strain else None)
+
+    return make_soup
+
+
+def parse_listing(name, features="lxml", strain=True, response=None):
+    """
+    parse() result of the parser for its fixture page (or response),
+    the soups are built with features and with or without the parser strainer.
+    """
+    response = response or read_listing(name)
+    parser = getattr(download_article, name)()
+    with mock.patch.object(download_article.http_client, "get",
+                           return_value=response), \
+            mock.patch.object(download_article.http_client, "post",
+                              return_value=response), \
+            mock.patch.object(soup_builder, "make_soup",
+                              soup_factory(features, strain)):
+        return parser.parse(LISTINGS[name][1])
+
+
+class ListingStrainerTest(unittest.TestCase):
+    """
+    The strainers only skip building the parts of the page the parsers
+    never read: entries must be the same as from the full tree, and the
+    same with html.parser, which repairs broken markup differently.
+    """
+
+    def test_same_entries_with_and_without_strainer(self):
+        for name in LISTINGS:
+            with self.subTest(parser=name):
+                expected = parse_listing(name, "lxml", strain=False)["entries"]
+                self.assertTrue(expected)
+                for features, strain in SOUP_MODES:
+                    result = parse_listing(name, features, strain)
+                    self.assertEqual(
+                        result["entries"], expected, f"{features}, strain={strain}")
+
+    def test_production_soup_builder(self):
+        # soup_builder.make_soup itself with the strainer of the parser
+        for name in LISTINGS:
+            with self.subTest(parser=name):
+                response = read_listing(name)
+                parser = getattr(download_article, name)()
+                with mock.patch.object(download_article.http_client, "get",
+                                       return_value=response):
+                    result = parser.parse(LISTINGS[name][1])
+                self.assertEqual(
+                    result["entries"], parse_listing(name, "lxml", False)["entries"])
+
+
+class ListingPublishedTest(unittest.TestCase):
+    """
+    Each date format of the fixture pages gives the time written
+    on the site as an aware datetime in UTC.
+    """
+
+    def test_published(self):
+        with open(PUBLISHED_PATH, encoding="utf-8") as f:
+            expected = json.load(f)
+        self.assertEqual(set(expected), set(LISTINGS))
+        for name, entries in expected.items():
+            with self.subTest(parser=name):
+                result = parse_listing(name)["entries"]
+                self.assertEqual(
+                    [(e.link, e.published.isoformat()) for e in result],
+                    [(e["link"], e["published"]) for e in entries])
+                for entry in result:
+                    self.assertIs(entry.published.tzinfo, datetime.timezone.utc)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+import soup_builder
+
+
+class HtmlTextTest(unittest.TestCase):
+    """
+    Listing bodies are stored as the text news_text_update uses as is.
+    """
+
+    def test_markup_removed(self):
+        body = (
+            '<p>Торгпредство&nbsp;России провело\n <b>встречу</b></p>'
+            '<p><img src="/a.jpg"><br>Вторая   часть</p>'
+        )
+        self.assertEqual(
+            soup_builder.html_text(body), "Торгпредство России провело встречу Вторая часть")
+
+    def test_plain_text_unchanged(self):
+        text = "Текст без разметки"
+        self.assertEqual(soup_builder.html_text(text), text)
+        self.assertEqual(soup_builder.html_text(soup_builder.html_text(text)), text)
+
+    def test_empty(self):
+        for body in ["", " \n ", "<p> </p>", '<div><img src="/a.jpg"></div>']:
+            with self.subTest(body=body):
+                self.assertEqual(soup_builder.html_text(body), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ POSTGRES_HOST = os.getenv("POSTGRES_HOST")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT")
 
 TFIDF_SERVER = os.getenv("TFIDF_SERVER")
+TFIDF_BATCH_SIZE = int(os.getenv("TFIDF_BATCH_SIZE", 16))
 
 DELTA_DATE_ARTICLE = int(os.getenv("DELTA_DATE_ARTICLE"))
 DELTA_DATE_TEXT=int(os.getenv("DELTA_DATE_TEXT"))
@@ -19,6 +20,23 @@ DELTA_DATE_TEXT=int(os.getenv("DELTA_DATE_TEXT"))
 DOWNLOAD_ARTICLE_SLEEP = int(os.getenv("DOWNLOAD_ARTICLE_SLEEP"))*60
 DOWNLOAD_TEXT_SLEEP = int(os.getenv("DOWNLOAD_TEXT_SLEEP"))*60
 
+TEXT_WORKERS = int(os.getenv("TEXT_WORKERS", 8))
+TEXT_WORKERS_PER_HOST = int(os.getenv("TEXT_WORKERS_PER_HOST", 2))
+TEXT_HOST_RATE = float(os.getenv("TEXT_HOST_RATE", 3))
+TEXT_HOST_BURST = int(os.getenv("TEXT_HOST_BURST", 1))
+TEXT_PARSE_WORKERS = int(os.getenv("TEXT_PARSE_WORKERS", 2))
+TEXT_SCORE_WORKERS = int(os.getenv("TEXT_SCORE_WORKERS", 1))
+TEXT_QUEUE_SIZE = int(os.getenv("TEXT_QUEUE_SIZE", 100))
+LISTING_CACHE_TTL = int(os.getenv("LISTING_CACHE_TTL", 600))
+
+HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", 30))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 50))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+USER_AGENT_POOL_SIZE = int(os.getenv("USER_AGENT_POOL_SIZE", 20))
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")
+
 DB_STRING = (
     f"{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}")
 DB_URI = f"postgresql+psycopg2://{DB_STRING}"
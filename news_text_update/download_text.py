@@ -4,13 +4,11 @@ import json
 import random
 import re
 import time
-import string
+import urllib.parse
+from collections import deque
 
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 
-from fake_useragent import UserAgent
 from newspaper import Article as Article_news
 from newspaper import ArticleException
 # Перенести в отдельный модуль
@@ -26,36 +24,23 @@ from newspaper import ArticleException
 
 from transliterate import translit
 
-from config import DELTA_DATE_TEXT, TFIDF_SERVER, engine
+from config import (DELTA_DATE_TEXT, LISTING_CACHE_TTL, TEXT_HOST_BURST,
+                    TEXT_HOST_RATE, TEXT_PARSE_WORKERS, TEXT_QUEUE_SIZE,
+                    TEXT_SCORE_WORKERS, TEXT_WORKERS, TEXT_WORKERS_PER_HOST,
+                    TFIDF_BATCH_SIZE, engine)
+import http_client
+import soup_builder
+from preprocessing import preprocess_text
 from models import Article, Feed
+from pipeline import Stage, run_pipeline
+from sentiment import SentimentClient
 from sqlalchemy import select, update
 from sqlalchemy.orm import sessionmaker
 
-# re_url = r"(?<Protocol>\w+):\/\/(?<Domain>[\w@][\w.:@]+)\/?[\w\.?=%&=\-@/$,]*"
+# listing responses shared by the articles of one source, cleared on every run
+listing_cache = http_client.ResponseCache(LISTING_CACHE_TTL)
 
-def preprocess_text(text):
-    exclude = set(string.punctuation)
-    clean_text = "".join(i for i in text.strip() if i not in exclude)
-    clean_text = re.sub(r'\n+', ' ', clean_text)
-    # remove punctuation
-    clean_text = re.sub(r'[^\w\s]', ' ', clean_text)
-    
-    # change multispaces to single space
-    clean_text = re.sub(r'\s+', ' ', clean_text)
-    
-    # delete collocations with years
-    pattern = r"\b(?:(\d{2}|\d{4})\s*(?:год(?:а|у)?|year))\b"
-    clean_text = re.sub(pattern, "", clean_text)
-    
-    # delete collocations with separate years
-    pattern = r"\b(?:(\d{2}|\d{4}))\b"
-    clean_text = re.sub(pattern, "", clean_text)
-    
-    # delete months
-    pattern = r'''January|February|March|April|May|June|July|August|September|October|November|December|январ[ья]|феврал[ья]|март[а]?|апрел[ья]|мая?|июн[ья]?(?:[яю]|е[ао])?|июл[ья]?[яи]?|август[а]?|сентябр[ья]?|октябр[ья]?|ноябр[ья]?|декабр[ья]'''
-    clean_text = re.sub(pattern, "", clean_text, flags = re.I)
-    
-    return clean_text    
+# re_url = r"(?<Protocol>\w+):\/\/(?<Domain>[\w@][\w.:@]+)\/?[\w\.?=%&=\-@/$,]*"
 
 
 class CommonParser:
@@ -64,18 +49,14 @@ class CommonParser:
     """
 
     def __init__(self, timeout=30, verify=True, headers=None):
-        ua = UserAgent()
         self.timeout = timeout
         self.verify = verify
-        self.headers = {"User-Agent": ua.random}
+        self.headers = http_client.ua_headers()
         if headers:
             self.headers.update(headers)
 
     def get(self, url):
-        """
-        TODO: add retry when status_code != 200
-        """
-        r = requests.get(url, timeout=self.timeout,
+        r = http_client.get(url, timeout=self.timeout,
                         verify=self.verify, headers=self.headers)
         return r.status_code, r.url, r.text
 
@@ -87,9 +68,20 @@ class CommonParser:
         return result
 
 
+def feed_loaded(news):
+    # feedparser gives a result for a failed request or a broken feed too
+    return news.get("status") == 200 and bool(news.get("entries"))
+
+
+def torg_pred_loaded(r_json):
+    return isinstance(r_json, dict) and bool(r_json.get("data"))
+
+
 def scrape_minpromtorg(article_news, url):
-    news = CommonParser(verify=True).parse(
-        "https://minpromtorg.gov.ru/api/ssp-news/v1/rss")
+    url_rss = "https://minpromtorg.gov.ru/api/ssp-news/v1/rss"
+    news = listing_cache.get_or_load(
+        url_rss, lambda: CommonParser(verify=True).parse(url_rss), feed_loaded)
+    main_div = ""
     for item in news["entries"]:
         if item["link"] == url:
             main_div = item["summary"]
@@ -101,8 +93,7 @@ def scrape_eu_commission(article_news, url):
     doc_id = url.rsplit("/", 1)[1]
     doc_id = doc_id.replace("_", "/")
     url_json = f"https://ec.europa.eu/commission/presscorner/api/documents?reference={doc_id}&language=en"
-    time.sleep(10)
-    r = requests.get(url_json, timeout=30)
+    r = http_client.get(url_json, timeout=30)
     res = r.json().get("docuLanguageResource")
     if res:
         article_news.download(input_html=res["htmlContent"])
@@ -121,31 +112,23 @@ def scrape_euraz_econ(article_news, url):
         article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 def scrape_mofa_japan(article_news, url):
-    r = requests.get(url)
+    r = http_client.get(url)
     r_html = r.content.decode("utf-8")
-    soup = BeautifulSoup(r_html, features="html.parser")
+    soup = soup_builder.make_soup(
+        r_html, soup_builder.only("div", id="maincontents"))
     main_div = soup.find("div", attrs={"id": "maincontents"})
     article_news.download(
         input_html="<html>" + main_div.text.rsplit("Related Links", 1)[0] + "</html>")
 
 
 def scrape_torg_pred(article_news, url):
-    ua = UserAgent()
     country_code = re.findall(r"https\:\/\/(\w+)\.", url)[0]
     url_json = "https://{country_code}.minpromtorg.gov.ru/api/ssp-news/v1/?isCurrentSiteOnly=true&per_page=10&page=1".format(
         country_code=country_code)
-    # # #  -------
-    # sess_recv = requests.Session()
-    # retry = Retry(connect=3, backoff_factor=0.5)
-    # adapter = HTTPAdapter(max_retries=retry)
-    # sess_recv.mount('https://', adapter)
-    # # #   --------
-
     try:
-        # r = sess_recv.get(url_json)
-        r = requests.get(url_json, headers={
-                        "User-Agent": ua.random}, verify=False)
-        r_json = r.json()
+        r_json = listing_cache.get_or_load(url_json, lambda: http_client.get(
+            url_json, headers=http_client.ua_headers(), verify=False).json(),
+            torg_pred_loaded)
         r_data = r_json.get("data")
         id_ = url.split("?id=")[-1]
         main_div = ""
@@ -158,30 +141,28 @@ def scrape_torg_pred(article_news, url):
     except Exception as e:
         print(e)
 
-def get_soup(url: str):
-    ua = UserAgent()
-    r = requests.get(url, headers={"User-Agent": ua.random})
+def get_soup(url: str, parse_only=None):
+    r = http_client.get(url, headers=http_client.ua_headers())
     try:
         r_html = r.content.decode("utf-8")
     except Exception as e:  
         print(f'Декодирован cp1251 {e}')   
         r_html = r.content.decode("cp1251")
-    soup = BeautifulSoup(r_html, features="html.parser")
+    soup = soup_builder.make_soup(r_html, parse_only)
     return soup
 
-def get_soup_not_verify(url: str):
-    ua = UserAgent()
-    r = requests.get(url, headers={"User-Agent": ua.random}, verify=False)
+def get_soup_not_verify(url: str, parse_only=None):
+    r = http_client.get(url, headers=http_client.ua_headers(), verify=False)
     try:
         r_html = r.content.decode("utf-8")
     except Exception as e:  
         print(f'Декодирован cp1251 {e}')   
         r_html = r.content.decode("cp1251")
-    soup = BeautifulSoup(r_html, features="html.parser")
+    soup = soup_builder.make_soup(r_html, parse_only)
     return soup
 
 def scrape_scmp(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("script", type="application/ld+json"))
     article_text = ""
     for s in soup.find_all("script", attrs={"type": "application/ld+json"}):
         s_json = json.loads(s.text)
@@ -192,19 +173,19 @@ def scrape_scmp(article_news, url):
 
 
 def scrape_anadolu(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "detay-icerik"))
     main_div = soup.find("div", attrs={"class": "detay-icerik"})
     article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 
 def scrape_mid(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "page-inner"))
     main_div = soup.find("div", attrs={"class": "page-inner"})
     article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 
 def scrape_cgtn(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", id="cmsMainContent"))
     main_div = soup.find("div", attrs={"id": "cmsMainContent"})
     text_list = []
     if main_div:
@@ -220,28 +201,27 @@ def scrape_cgtn(article_news, url):
 
 
 def scrape_ngv(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "project__wraper"))
     main_div = soup.find("div", attrs={"class": "project__wraper"})
     article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 
 def scrape_metalbulletin(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "text1"))
     main_div = soup.find("div", attrs={"class": "text1"})
     article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 
 def scrape_cdu(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "article"))
     main_div = soup.find("div", attrs={"class": "article"})
     article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 
 def scrape_argus(article_news, url):
-    ua = UserAgent()
     url = url.replace("/ru/", "/api/")
     url = re.sub(r"(\d{7})\-", r"\1/", url)
-    r = requests.get(url, headers={"User-Agent": ua.random}, timeout=10)
+    r = http_client.get(url, headers=http_client.ua_headers(), timeout=10)
     r_json = r.json()
     main_div = r_json.get("Body")
     article_news.download(input_html="<html>" + main_div + "</html>")
@@ -260,7 +240,7 @@ def scrape_businesslive(article_news, url):
 
 
 def scrape_nyt(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("p", re.compile(r"css.+")))
     main_divs = soup.find_all("p", attrs={"class": re.compile(r"css.+")})
     main_divs = " ".join([str(i) for i in main_divs])
     article_news.download(input_html="<html>" + main_divs + "</html>")
@@ -290,7 +270,7 @@ def scrape_nyt(article_news, url):
 
 
 def scrape_africabusinesscommunities(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "main-content"))
     main_div = soup.find_all("div", attrs={"class": "main-content"})
     if main_div:
         html = str(main_div[0])
@@ -300,14 +280,14 @@ def scrape_africabusinesscommunities(article_news, url):
 
 
 def scrape_vz(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "rel"))
     main_div = soup.find_all("div", attrs={"class": "rel"})[0]
     main_div = str(main_div)
     article_news.download(input_html="<html>" + main_div + "</html>")
 
 
 def scrape_vedomosti(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "article__body"))
     main_div = soup.find_all("div", attrs={"class": "article__body"})[0]
     main_text = main_div.find_all("p", attrs={"class": "box-paragraph__text"})
     main_text = [str(d)
@@ -317,14 +297,13 @@ def scrape_vedomosti(article_news, url):
 
 
 def scrape_exportcenter(article_news, url):
-    soup = get_soup(url)
+    soup = get_soup(url, soup_builder.only("div", "article__body"))
     main_div = soup.find("div", attrs={"class": "article__body"})
     article_news.download(input_html="<html>" + main_div.text + "</html>")
 
 
 def scrape_common(article_news, url):
-    ua = UserAgent()
-    r = requests.get(url, headers={"User-Agent": ua.random}, timeout=10)
+    r = http_client.get(url, headers=http_client.ua_headers(), timeout=10)
     if r.status_code != 200:
         raise ArticleException(r.status_code)
     r_html = r.content.decode("utf-8")
@@ -414,6 +393,33 @@ ParserByName = {
 }
 
 
+# requests per second for sites slower than TEXT_HOST_RATE, same keys as ParserByName
+RateByName = {
+    "eu_commission": 0.1,
+}
+
+
+# seconds the dispatcher waits when every host is busy
+DISPATCH_POLL = 0.1
+
+
+class TextJob:
+    """
+    An article passed through the text pipeline.
+    stored is True if the text was read from the database.
+    """
+
+    def __init__(self, article, text=None, stored=False):
+        self.article = article
+        self.article_news = None
+        self.text = text
+        self.stored = stored
+        # host slot taken by FeedTextDownloader.dispatch, released after download
+        self.host_slot = None
+        self.clean_text = None
+        self.sentiment = None
+
+
 class FeedTextDownloader():
     """
     Main class for feed downloads and database updates.
@@ -422,6 +428,10 @@ class FeedTextDownloader():
 
     def __init__(self):
         self.rss_raw = {}
+        self.rate_limiter = http_client.RateLimiter(
+            TEXT_HOST_RATE, TEXT_HOST_BURST)
+        self.host_limiter = http_client.HostLimiter(TEXT_WORKERS_PER_HOST)
+        self.sentiment = SentimentClient()
 
         Session = sessionmaker(engine)
         self.session = Session()
@@ -431,18 +441,183 @@ class FeedTextDownloader():
         return (datetime.datetime.now(
             datetime.timezone.utc) + datetime.timedelta(delta)).replace(hour=0, minute=0, second=0, microsecond=0)
 
+    def needs_download(self, job):
+        """
+        True if the job has no text yet. The body news_download saved with
+        the listing becomes the text if it is not empty after cleaning.
+        """
+        if job.text is None and job.article.text:
+            job.text = soup_builder.html_text(job.article.text) or None
+        return job.text is None
+
+    def dispatch(self, jobs):
+        """
+        Yields the jobs for the fetch stage. A job that needs a download
+        is yielded only when its host has a free slot (TEXT_WORKERS_PER_HOST)
+        and a token of its rate, so fetch workers never wait for a slow site
+        while jobs for other sites are ready.
+        """
+        pending = {}
+        for job in jobs:
+            if not self.needs_download(job):
+                yield job
+                continue
+            try:
+                host = urllib.parse.urlsplit(job.article.url).netloc.lower()
+            except Exception as e:
+                print(f"Skipped article {job.article.id} {job.article.url}: {e}")
+                continue
+            pending.setdefault(host, deque()).append(job)
+
+        while pending:
+            waits = []
+            for host in list(pending):
+                queue = pending[host]
+                while queue:
+                    article = queue[0].article
+                    try:
+                        slot = self.host_limiter.get(article.url)
+                    except Exception as e:
+                        print(f"Skipped article {article.id} {article.url}: {e}")
+                        queue.popleft()
+                        continue
+                    if not slot.acquire(blocking=False):
+                        waits.append(DISPATCH_POLL)
+                        break
+                    try:
+                        delay = self.rate_limiter.try_acquire(
+                            article.url, RateByName.get(article.name, TEXT_HOST_RATE))
+                    except Exception as e:
+                        slot.release()
+                        print(f"Skipped article {article.id} {article.url}: {e}")
+                        queue.popleft()
+                        continue
+                    if delay:
+                        slot.release()
+                        waits.append(delay)
+                        break
+                    job = queue.popleft()
+                    job.host_slot = slot
+                    yield job
+                if not queue:
+                    del pending[host]
+            if waits:
+                time.sleep(min(waits))
+
+    def fetch(self, job):
+        """
+        Pipeline stage: download the article page
+        or take the body saved with the listing.
+        """
+        try:
+            return self.download(job)
+        finally:
+            if job.host_slot is not None:
+                job.host_slot.release()
+                job.host_slot = None
+
+    def download(self, job):
+        if job.text is not None:
+            return job
+        article = job.article
+        if article.tags.find("ru") > 0:
+            lang = "ru"
+        else:
+            lang = "en"
+        print(
+            f'Id = {article.feed_id} ->  {article.published_parsed.date()} сайт {article.url} статья - "{article.title}"')
+
+        article_news = Article_news(article.url, language=lang)
+
+        if article.name in ParserByName:
+            ParserByName[article.name](article_news, article.url)
+        elif "torg_pred_" in article.name:
+            scrape_torg_pred(article_news, article.url)
+        elif "cgtn_" in article.name:
+            scrape_cgtn(article_news, article.url)
+        # elif "bloomberg" in article.name:
+        #     rez = scrape_bloomberg(article_news, article.url)
+        #     article_news = rez[0]
+        #     url = rez[1]    
+        else:
+            article_news.download()
+        job.article_news = article_news
+        return job
+
+    def parse(self, job):
+        """
+        Pipeline stage: extract the article text from the page.
+        """
+        if job.text is not None:
+            return job
+        job.article_news.parse()
+
+        text = re.sub("\n{2,}", " ", job.article_news.text)
+        job.article_news = None
+        if any(
+            text.startswith(i)
+            for i in ["Регистрация пройдена успешно!", "Please Enable Cookies", "Access Denied", "Your username or password is invalid"]
+        ):
+            print("Will retry next time")
+            return None
+        if text == '':
+            return None
+        job.text = text
+        return job
+
+    def clean(self, job):
+        """
+        Pipeline stage: prepare the text for the sentiment model.
+        """
+        prom_text = job.article.title+'/n/n'+job.text
+        job.clean_text = preprocess_text(prom_text)
+        return job
+
+    def score(self, jobs):
+        """
+        Pipeline stage: score a batch of texts.
+        """
+        scores = self.sentiment.score([job.clean_text for job in jobs])
+        for job, sentiment in zip(jobs, scores):
+            job.sentiment = sentiment
+            job.clean_text = None
+        return jobs
+
+    def save_texts(self, jobs):
+        """
+        Pipeline stage: save a batch of texts with one commit.
+        A text without a score is saved with empty sentiment
+        and is scored again on the next run.
+        """
+        saved = []
+        try:
+            for job in jobs:
+                if job.stored and job.sentiment is None:
+                    continue
+                self.session.execute(update(Article).where(Article.id == job.article.id).values(
+                text = job.text, is_text_parsed = True, sentiment = job.sentiment))
+                saved.append(job)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(e)
+            return []
+        return saved
+
     def get_texts(self):
         """
         Scrape and parse news texts
         """
         time.sleep(5)
+        listing_cache.clear()
 
         start_date = self.get_datetime(-DELTA_DATE_TEXT)
         end_date = self.get_datetime(1)
 
         articles_to_parse = self.session.execute(select(Article.id, Article.url, Article.feed_id,
                                                         Article.published_parsed, Article.title,
-                                                        Feed.url, Feed.tags, Feed.name).where(
+                                                        Article.text, Feed.url, Feed.tags,
+                                                        Feed.name).where(
             Article.is_text_parsed == False,
             Feed.used == True,
             Feed.available == True,
@@ -451,57 +626,33 @@ class FeedTextDownloader():
             Feed.id == Article.feed_id)
             .order_by(Article.published_parsed.desc())).all()
 
+        # texts saved by the previous runs when TFIDF_SERVER was unavailable
+        articles_to_score = self.session.execute(select(Article.id, Article.title, Article.text).where(
+            Article.is_text_parsed == True,
+            Article.sentiment == None,
+            Article.text != None,
+            Article.published_parsed >= start_date,
+            Article.published_parsed <= end_date)).all()
+
         random.shuffle(articles_to_parse)
+        jobs = [TextJob(article, article.text, stored=True) for article in articles_to_score]
+        jobs += [TextJob(article) for article in articles_to_parse]
+
+        stages = [
+            Stage("fetch", self.fetch, TEXT_WORKERS),
+            Stage("parse", self.parse, TEXT_PARSE_WORKERS),
+            Stage("clean", self.clean, TEXT_PARSE_WORKERS),
+            Stage("score", self.score, TEXT_SCORE_WORKERS, TFIDF_BATCH_SIZE),
+            Stage("save", self.save_texts, 1, TFIDF_BATCH_SIZE),
+        ]
         count = 0
-        for article in articles_to_parse:
-            try:
-                if article.tags.find("ru") > 0:
-                    lang = "ru"
-                else:
-                    lang = "en"
-                print(
-                    f'Id = {article.feed_id} ->  {article.published_parsed.date()} сайт {article.url} статья - "{article.title}"')
-
-                article_news = Article_news(article.url, language=lang)
-
-                if article.name in ParserByName:
-                    ParserByName[article.name](article_news, article.url)
-                elif "torg_pred_" in article.name:
-                    scrape_torg_pred(article_news, article.url)
-                elif "cgtn_" in article.name:
-                    scrape_cgtn(article_news, article.url)
-                # elif "bloomberg" in article.name:
-                #     rez = scrape_bloomberg(article_news, article.url)
-                #     article_news = rez[0]
-                #     url = rez[1]    
-                else:
-                    article_news.download()
-
-                article_news.parse()    
-
-                text = re.sub("\n{2,}", " ", article_news.text)
-                if any(
-                    text.startswith(i)
-                    for i in ["Регистрация пройдена успешно!", "Please Enable Cookies", "Access Denied", "Your username or password is invalid"]
-                ):
-                    print("Will retry next time")
-                    continue
-                if text == '':
-                    continue
-                else:
-                    # if article.feed_id == 2027:
-                    #     self.session.execute(update(Article).where(Article.id == article.id).values(
-                    #     text=text, is_text_parsed=True, url=url))
-                    # else:  
-                    prom_text = article.title+'/n/n'+text 
-                    clean_text = preprocess_text(prom_text)
-                    probability = requests.post(TFIDF_SERVER, json={"text": clean_text}).json() 
-                    self.session.execute(update(Article).where(Article.id == article.id).values(
-                    text = text, is_text_parsed = True, sentiment = probability["score 2"]))
-                    count += 1
-                    self.session.commit()
-                time.sleep(0.3)
-            except Exception as e:
-                print(e)
+        not_scored = 0
+        for job in run_pipeline(self.dispatch(jobs), stages, TEXT_QUEUE_SIZE):
+            if job.sentiment is None:
+                not_scored += 1
+            else:
+                count += 1
         print(f'Обработано {count} записей')
+        if not_scored:
+            print(f'Без оценки тональности {not_scored} записей')
         self.session.close()
@@ -0,0 +1,225 @@
+"""
+HTTP session for the scrapers and the sentiment client of news_text_update.
+Connections are kept alive and pooled per host, failed GET requests
+are retried with exponential backoff.
+"""
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (HTTP_BACKOFF, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+                    HTTP_RETRIES, HTTP_TIMEOUT, USER_AGENT_POOL_SIZE)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(pool_connections=HTTP_POOL_CONNECTIONS,
+                 pool_maxsize=HTTP_POOL_MAXSIZE,
+                 retries=HTTP_RETRIES,
+                 backoff=HTTP_BACKOFF):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        # POST is not idempotent, e.g. a repeated sentiment request
+        allowed_methods=frozenset(["HEAD", "GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def request(method, url, **kwargs):
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_session().request(method, url, **kwargs)
+
+
+class HostLimiter:
+    """
+    Limits the number of simultaneous requests to the same host.
+    """
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def get(self, url):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(
+                    self.per_host)
+            return self.semaphores[host]
+
+
+class TokenBucket:
+    """
+    Allows rate requests per second on average and bursts of up to
+    capacity requests. acquire() blocks until a request is allowed,
+    try_acquire() does not wait.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Take a token if there is one. Returns 0 if it was taken,
+        otherwise the seconds until the next token.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+            return 0
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Token buckets by host shared between worker threads.
+    The rate of a host is fixed by the first request for it.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def bucket(self, url, rate=None):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(
+                    rate or self.rate, self.capacity)
+            return self.buckets[host]
+
+    def acquire(self, url, rate=None):
+        self.bucket(url, rate).acquire()
+
+    def try_acquire(self, url, rate=None):
+        return self.bucket(url, rate).try_acquire()
+
+
+class ResponseCache:
+    """
+    Values loaded by key (usually URL) and kept for ttl seconds.
+    Threads asking for the same key wait for a single load,
+    failed loads and values which are not valid are not cached.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.locks = {}
+        self.values = {}
+
+    def get_or_load(self, key, loader, valid=bool):
+        """
+        valid(value) is False for an empty or broken answer, such value
+        is returned but the next call loads it again.
+        """
+        with self.lock:
+            key_lock = self.locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self.values.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+            value = loader()
+            if valid(value):
+                self.values[key] = (time.monotonic(), value)
+            return value
+
+    def clear(self):
+        with self.lock:
+            self.locks.clear()
+            self.values.clear()
+
+
+class UserAgentProvider:
+    """
+    Random User-Agent strings.
+    fake_useragent data is loaded once on first use and a pool of strings
+    is kept in memory. Pass user_agents to pin the values, e.g. in tests.
+    """
+
+    def __init__(self, pool_size=USER_AGENT_POOL_SIZE, user_agents=None):
+        self.pool_size = pool_size
+        self.user_agents = list(user_agents) if user_agents else None
+        self.lock = threading.Lock()
+
+    def load(self):
+        ua = UserAgent()
+        return list({ua.random for _ in range(self.pool_size)})
+
+    def random(self):
+        if self.user_agents is None:
+            with self.lock:
+                if self.user_agents is None:
+                    self.user_agents = self.load()
+        return random.choice(self.user_agents)
+
+
+_user_agents = UserAgentProvider()
+
+
+def set_user_agent_provider(provider):
+    global _user_agents
+    _user_agents = provider
+
+
+def random_user_agent():
+    return _user_agents.random()
+
+
+def ua_headers():
+    return {"User-Agent": random_user_agent()}
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
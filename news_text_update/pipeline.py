@@ -0,0 +1,99 @@
+import queue
+import threading
+
+STOP = object()
+EMPTY = object()
+
+# seconds a batch stage waits for more items before it processes a partial batch
+BATCH_WAIT = 1
+
+
+class Stage:
+    """
+    One step of a pipeline run by several worker threads.
+    func takes an item and returns the item for the next stage
+    or None to drop it. With batch_size > 1 func takes and returns
+    a list of items.
+    """
+
+    def __init__(self, name, func, workers=1, batch_size=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def process(self, batch, outbox):
+        if not batch:
+            return
+        try:
+            if self.batch_size > 1:
+                results = self.func(batch)
+            else:
+                results = [self.func(batch[0])]
+        except Exception as e:
+            print(f"{self.name}: {e}")
+            return
+        for result in results:
+            if result is not None:
+                outbox.put(result)
+
+    def work(self, inbox, outbox):
+        batch = []
+        while True:
+            try:
+                item = inbox.get(timeout=BATCH_WAIT if batch else None)
+            except queue.Empty:
+                item = EMPTY
+            if item is STOP:
+                # leave the marker for the other workers of this stage
+                inbox.put(STOP)
+                break
+            if item is not EMPTY:
+                batch.append(item)
+            if item is EMPTY or len(batch) >= self.batch_size:
+                self.process(batch, outbox)
+                batch = []
+        self.process(batch, outbox)
+
+    def start(self, inbox, outbox):
+        workers = [
+            threading.Thread(target=self.work, args=(inbox, outbox), daemon=True)
+            for _ in range(self.workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def close():
+            for worker in workers:
+                worker.join()
+            outbox.put(STOP)
+
+        threading.Thread(target=close, daemon=True).start()
+
+
+def run_pipeline(items, stages, queue_size):
+    """
+    Pass items through the stages connected by queues of queue_size.
+    Yields the items which came out of the last stage.
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    for stage, inbox, outbox in zip(stages, queues, queues[1:]):
+        stage.start(inbox, outbox)
+
+    def feed():
+        try:
+            for item in items:
+                queues[0].put(item)
+        except Exception as e:
+            print(f"pipeline input: {e}")
+        finally:
+            # the stages and the caller wait for STOP, send it whatever happens
+            queues[0].put(STOP)
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    while True:
+        item = queues[-1].get()
+        if item is STOP:
+            break
+        yield item
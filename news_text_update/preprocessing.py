@@ -0,0 +1,27 @@
+"""
+Text cleaning before the sentiment model.
+"""
+import re
+import string
+
+PUNCTUATION_RE = re.compile(f"[{re.escape(string.punctuation)}]+")
+# runs of spaces, line breaks and punctuation left after PUNCTUATION_RE
+NON_WORD_RE = re.compile(r'\W+')
+# collocations with years
+YEAR_WORD_RE = re.compile(r"\b(?:(\d{2}|\d{4})\s*(?:год(?:а|у)?|year))\b")
+# separate years
+YEAR_RE = re.compile(r"\b(?:(\d{2}|\d{4}))\b")
+# the lookahead skips positions which can not start a month name
+MONTH_RE = re.compile(r'''(?=[jfmasondяфмаисонд])(?:January|February|March|April|May|June|July|August|September|October|November|December|январ[ья]|феврал[ья]|март[а]?|апрел[ья]|мая?|июн[ья]?(?:[яю]|е[ао])?|июл[ья]?[яи]?|август[а]?|сентябр[ья]?|октябр[ья]?|ноябр[ья]?|декабр[ья])''', re.I)
+
+
+def preprocess_text(text):
+    # remove punctuation
+    clean_text = PUNCTUATION_RE.sub("", text.strip())
+    # change the rest of punctuation and multispaces to single space
+    clean_text = NON_WORD_RE.sub(' ', clean_text)
+    clean_text = YEAR_WORD_RE.sub("", clean_text)
+    clean_text = YEAR_RE.sub("", clean_text)
+    # delete months
+    clean_text = MONTH_RE.sub("", clean_text)
+    return clean_text
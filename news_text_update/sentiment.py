@@ -0,0 +1,72 @@
+import http_client
+from config import HTTP_TIMEOUT, TFIDF_BATCH_SIZE, TFIDF_SERVER
+
+# answers of a server which does not know the {"texts": [...]} request
+UNSUPPORTED_STATUSES = (400, 404, 422)
+
+
+class BatchNotSupported(Exception):
+    """
+    The server rejected the batch request itself, not the texts.
+    """
+
+
+class SentimentClient:
+    """
+    Client for the TFIDF_SERVER sentiment model.
+    Texts are sent in batches as {"texts": [...]} and the server answers
+    {"scores": [{"score 2": ...}, ...]}. If the server does not accept
+    batches (UNSUPPORTED_STATUSES), every text is sent in its own
+    {"text": ...} request. A batch which failed for another reason
+    (5xx, timeout, broken response) gets None scores and the texts
+    are scored by the next run.
+    """
+
+    def __init__(self, url=TFIDF_SERVER, batch_size=TFIDF_BATCH_SIZE,
+                 timeout=HTTP_TIMEOUT):
+        self.url = url
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.batch_supported = batch_size > 1
+
+    def score_one(self, text):
+        try:
+            probability = http_client.post(
+                self.url, json={"text": text}, timeout=self.timeout).json()
+            return probability["score 2"]
+        except Exception as e:
+            print(f"Sentiment scoring failed: {e}")
+            return None
+
+    def score_batch(self, texts):
+        r = http_client.post(self.url, json={"texts": texts}, timeout=self.timeout)
+        if r.status_code in UNSUPPORTED_STATUSES:
+            raise BatchNotSupported(f"status {r.status_code}")
+        if r.status_code != 200:
+            raise ValueError(f"status {r.status_code}")
+        scores = r.json().get("scores")
+        if not isinstance(scores, list) or len(scores) != len(texts):
+            raise ValueError("no scores in response")
+        return [score["score 2"] for score in scores]
+
+    def score(self, texts):
+        """
+        Returns the "score 2" value for every text, None if scoring failed.
+        """
+        scores = []
+        step = max(self.batch_size, 1)
+        for i in range(0, len(texts), step):
+            chunk = texts[i:i + step]
+            if self.batch_supported:
+                try:
+                    scores += self.score_batch(chunk)
+                    continue
+                except BatchNotSupported as e:
+                    print(f"Batch scoring is not supported by {self.url}: {e}")
+                    self.batch_supported = False
+                except Exception as e:
+                    print(f"Batch scoring failed: {e}")
+                    scores += [None] * len(chunk)
+                    continue
+            scores += [self.score_one(text) for text in chunk]
+        return scores
@@ -0,0 +1,55 @@
+"""
+BeautifulSoup helpers for listing parsers and scrapers.
+The same module is used by news_download and news_text_update.
+Pages are parsed with HTML_PARSER (lxml by default, html.parser if lxml
+is not installed); pass parse_only=only(...) to build the tree only for
+the part of the page the parser reads.
+"""
+import importlib.util
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import HTML_PARSER
+
+if HTML_PARSER == "lxml" and importlib.util.find_spec("lxml") is None:
+    FEATURES = "html.parser"
+else:
+    FEATURES = HTML_PARSER
+
+
+def has_class(css_class):
+    """
+    SoupStrainer attribute matcher which works like class_=css_class
+    in find_all: css_class (a string or a compiled pattern) matches
+    one of the classes or the whole class string.
+    """
+
+    def match(value):
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        if isinstance(css_class, str):
+            return css_class in classes or " ".join(classes) == css_class
+        return any(css_class.search(c) for c in classes + [" ".join(classes)])
+
+    return match
+
+
+def only(name=None, css_class=None, **attrs):
+    """
+    Keep only name tags with css_class and attrs together with their contents.
+    """
+    if css_class:
+        attrs["class"] = has_class(css_class)
+    return SoupStrainer(name, attrs=attrs)
+
+
+def make_soup(markup, parse_only=None):
+    return BeautifulSoup(markup, features=FEATURES, parse_only=parse_only)
+
+
+def html_text(markup):
+    """
+    Text of an HTML fragment with the whitespace collapsed, "" if it has none.
+    """
+    return " ".join(make_soup(markup).get_text(" ").split())
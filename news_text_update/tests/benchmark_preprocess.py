@@ -0,0 +1,60 @@
+"""
+Micro-benchmark of preprocess_text against the original implementation.
+Run from news_text_update: python -m tests.benchmark_preprocess [repeat]
+The corpus is built from the golden file texts joined into article sized texts.
+"""
+import json
+import re
+import string
+import sys
+import timeit
+
+from preprocessing import preprocess_text
+from tests.test_preprocessing import GOLDEN_PATH
+
+# texts joined into one article of the corpus
+ARTICLE_PARTS = 40
+
+
+def reference_preprocess_text(text):
+    # the implementation before the precompiled patterns
+    exclude = set(string.punctuation)
+    clean_text = "".join(i for i in text.strip() if i not in exclude)
+    clean_text = re.sub(r'\n+', ' ', clean_text)
+    clean_text = re.sub(r'[^\w\s]', ' ', clean_text)
+    clean_text = re.sub(r'\s+', ' ', clean_text)
+    pattern = r"\b(?:(\d{2}|\d{4})\s*(?:год(?:а|у)?|year))\b"
+    clean_text = re.sub(pattern, "", clean_text)
+    pattern = r"\b(?:(\d{2}|\d{4}))\b"
+    clean_text = re.sub(pattern, "", clean_text)
+    pattern = r'''January|February|March|April|May|June|July|August|September|October|November|December|январ[ья]|феврал[ья]|март[а]?|апрел[ья]|мая?|июн[ья]?(?:[яю]|е[ао])?|июл[ья]?[яи]?|август[а]?|сентябр[ья]?|октябр[ья]?|ноябр[ья]?|декабр[ья]'''
+    return re.sub(pattern, "", clean_text, flags=re.I)
+
+
+def load_corpus():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        texts = [case["input"] for case in json.load(f) if case["input"].strip()]
+    return [
+        "\n\n".join(texts[(i + j) % len(texts)] for j in range(ARTICLE_PARTS))
+        for i in range(len(texts))
+    ]
+
+
+def main(repeat=20):
+    corpus = load_corpus()
+    for text in corpus:
+        assert preprocess_text(text) == reference_preprocess_text(text)
+    size = sum(len(text) for text in corpus)
+    print(f"{len(corpus)} texts, {size} characters, {repeat} runs")
+    results = {}
+    for name, func in [("reference", reference_preprocess_text),
+                       ("preprocess_text", preprocess_text)]:
+        seconds = min(timeit.repeat(
+            lambda: [func(text) for text in corpus], number=1, repeat=repeat))
+        results[name] = seconds
+        print(f"{name}: {seconds / len(corpus) * 1e6:.0f} us per text")
+    print(f"speedup: {results['reference'] / results['preprocess_text']:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
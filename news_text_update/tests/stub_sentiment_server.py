@@ -0,0 +1,88 @@
+"""
+Local stand-in for TFIDF_SERVER.
+{"text": ...} is answered with {"score 2": ...}. With batches enabled
+{"texts": [...]} is answered with {"scores": [{"score 2": ...}, ...]},
+otherwise it gets unsupported_status (422) like a server that knows only
+single texts. failures and delay let the tests imitate a broken server.
+Run from news_text_update: python -m tests.stub_sentiment_server [port] [--no-batch]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_score(text):
+    # any stable value the tests can compute too
+    return round(len(text) % 100 / 100, 2)
+
+
+class SentimentHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        data = json.loads(body or b"{}")
+        self.server.requests.append(data)
+        time.sleep(self.server.delay)
+        if self.server.failures:
+            self.reply(self.server.failures.pop(0), {"detail": "stub failure"})
+        elif "text" in data:
+            self.reply(200, {"score 2": stub_score(data["text"])})
+        elif "texts" in data and self.server.batch:
+            self.reply(200, {"scores": [
+                {"score 2": stub_score(text)} for text in data["texts"]]})
+        else:
+            self.reply(self.server.unsupported_status,
+                       {"detail": "field text is required"})
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSentimentServer(ThreadingHTTPServer):
+    """
+    The server keeps the bodies of all requests in requests.
+    """
+
+    def __init__(self, port=0, batch=True, unsupported_status=422):
+        super().__init__(("127.0.0.1", port), SentimentHandler)
+        self.batch = batch
+        self.unsupported_status = unsupported_status
+        self.requests = []
+        # statuses answered to the next requests instead of the scores
+        self.failures = []
+        # seconds to wait before every answer
+        self.delay = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def handle_error(self, request, client_address):
+        # a client which timed out has closed the connection already
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--no-batch"]
+    server = StubSentimentServer(
+        int(args[0]) if args else 8000, batch="--no-batch" not in sys.argv)
+    print(f"Listening on {server.url}, batches {'on' if server.batch else 'off'}")
+    server.serve_forever()
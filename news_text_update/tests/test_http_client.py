@@ -0,0 +1,52 @@
+import unittest
+
+import http_client
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = http_client.ResponseCache(ttl=600)
+        self.loads = []
+
+    def loader(self, value):
+        def load():
+            self.loads.append(value)
+            return value
+
+        return load
+
+    def test_value_is_cached(self):
+        self.assertEqual(self.cache.get_or_load("url", self.loader({"data": [1]})), {"data": [1]})
+        self.assertEqual(self.cache.get_or_load("url", self.loader({"data": [2]})), {"data": [1]})
+        self.assertEqual(len(self.loads), 1)
+
+    def test_empty_value_is_loaded_again(self):
+        for empty in [None, {}, []]:
+            with self.subTest(value=empty):
+                self.assertEqual(self.cache.get_or_load("url", self.loader(empty)), empty)
+        self.assertEqual(self.cache.get_or_load("url", self.loader({"data": [1]})), {"data": [1]})
+        self.assertEqual(len(self.loads), 4)
+
+    def test_invalid_value_is_loaded_again(self):
+        def valid(value):
+            return bool(value.get("data"))
+
+        broken = {"status": 500}
+        self.assertEqual(self.cache.get_or_load("url", self.loader(broken), valid), broken)
+        self.assertEqual(
+            self.cache.get_or_load("url", self.loader({"data": [1]}), valid), {"data": [1]})
+        self.assertEqual(
+            self.cache.get_or_load("url", self.loader({"data": [2]}), valid), {"data": [1]})
+        self.assertEqual(len(self.loads), 2)
+
+    def test_failed_load_is_not_cached(self):
+        def fail():
+            raise ValueError("not json")
+
+        with self.assertRaises(ValueError):
+            self.cache.get_or_load("url", fail)
+        self.assertEqual(self.cache.get_or_load("url", self.loader({"data": [1]})), {"data": [1]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from pipeline import Stage, run_pipeline
+
+
+class RunPipelineTest(unittest.TestCase):
+    def test_items_pass_all_stages(self):
+        stages = [
+            Stage("double", lambda x: x * 2, workers=2),
+            Stage("drop odd", lambda x: x if x % 4 == 0 else None),
+            Stage("batch", lambda batch: [sum(batch)], batch_size=100),
+        ]
+        self.assertEqual(list(run_pipeline(range(10), stages, 5)), [40])
+
+    def test_failing_input_stops_pipeline(self):
+        def items():
+            yield 1
+            yield 2
+            raise ValueError("bad row")
+
+        stages = [Stage("same", lambda x: x, workers=2)]
+        self.assertEqual(sorted(run_pipeline(items(), stages, 5)), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import json
+import os
+import unittest
+
+from preprocessing import preprocess_text
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "preprocess_golden.json")
+
+
+class PreprocessTextTest(unittest.TestCase):
+    """
+    preprocess_text must give the same output as the original
+    implementation, expected values in the golden file were made by it.
+    """
+
+    def test_golden(self):
+        with open(GOLDEN_PATH, encoding="utf-8") as f:
+            golden = json.load(f)
+        for case in golden:
+            with self.subTest(text=case["input"][:40]):
+                self.assertEqual(preprocess_text(case["input"]), case["expected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from sentiment import UNSUPPORTED_STATUSES, SentimentClient
+from tests.stub_sentiment_server import StubSentimentServer, stub_score
+
+TEXTS = [f"текст статьи номер {i} " * (i + 1) for i in range(10)]
+
+
+class SentimentClientTest(unittest.TestCase):
+    def start_server(self, batch, **kwargs):
+        server = StubSentimentServer(batch=batch, **kwargs).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_batches(self):
+        server = self.start_server(batch=True)
+        client = SentimentClient(server.url, batch_size=4)
+        self.assertEqual(client.score(TEXTS), [stub_score(t) for t in TEXTS])
+        self.assertEqual(
+            [request["texts"] for request in server.requests],
+            [TEXTS[0:4], TEXTS[4:8], TEXTS[8:10]])
+        self.assertTrue(client.batch_supported)
+
+    def test_single_texts_if_batches_fail(self):
+        server = self.start_server(batch=False)
+        client = SentimentClient(server.url, batch_size=4)
+        self.assertEqual(client.score(TEXTS), [stub_score(t) for t in TEXTS])
+        self.assertFalse(client.batch_supported)
+        # one rejected batch, then every text on its own
+        self.assertEqual(server.requests[0], {"texts": TEXTS[0:4]})
+        self.assertEqual(
+            [request["text"] for request in server.requests[1:]], TEXTS)
+
+        # the client does not try batches again
+        server.requests.clear()
+        client.score(TEXTS[:2])
+        self.assertEqual(server.requests, [{"text": t} for t in TEXTS[:2]])
+
+    def test_single_texts_on_unsupported_statuses(self):
+        for status in UNSUPPORTED_STATUSES:
+            with self.subTest(status=status):
+                server = self.start_server(batch=False, unsupported_status=status)
+                client = SentimentClient(server.url, batch_size=4)
+                self.assertEqual(client.score(TEXTS), [stub_score(t) for t in TEXTS])
+                self.assertFalse(client.batch_supported)
+
+    def test_server_error_keeps_batches(self):
+        server = self.start_server(batch=True)
+        server.failures = [500]
+        client = SentimentClient(server.url, batch_size=4)
+        # the failed batch is left for the next run, not sent text by text
+        self.assertEqual(
+            client.score(TEXTS),
+            [None] * 4 + [stub_score(t) for t in TEXTS[4:]])
+        self.assertTrue(client.batch_supported)
+        self.assertEqual(
+            [request["texts"] for request in server.requests],
+            [TEXTS[0:4], TEXTS[4:8], TEXTS[8:10]])
+
+    def test_timeout_keeps_batches(self):
+        server = self.start_server(batch=True)
+        server.delay = 0.5
+        client = SentimentClient(server.url, batch_size=4, timeout=0.1)
+        self.assertEqual(client.score(TEXTS[:4]), [None] * 4)
+        self.assertTrue(client.batch_supported)
+
+        server.delay = 0
+        client.timeout = 5
+        self.assertEqual(client.score(TEXTS[:4]), [stub_score(t) for t in TEXTS[:4]])
+        self.assertEqual(server.requests[-1], {"texts": TEXTS[:4]})
+
+    def test_batch_size_one_sends_single_texts(self):
+        server = self.start_server(batch=True)
+        client = SentimentClient(server.url, batch_size=1)
+        self.assertEqual(client.score(TEXTS[:3]), [stub_score(t) for t in TEXTS[:3]])
+        self.assertEqual(server.requests, [{"text": t} for t in TEXTS[:3]])
+
+
+if __name__ == "__main__":
+    unittest.main()